@@ -0,0 +1,395 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# The MIT License (MIT)
+#
+# Copyright (c) 2025, Roland Rickborn (r_2@gmx.net)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+# ---------------------------------------------------------------------------
+
+import argparse
+import contextlib
+import functools
+import gc
+import io
+import itertools
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import src.ebm.bm2xls as bm2xls
+import src.ebm.bookmark as bookmark
+import src.ebm.bookmark_shelf as bookmark_shelf
+import src.ebm.pipeline as pipeline
+import src.ebm.utils as utils
+import src.ebm.xls2bm as xls2bm
+
+try:
+    import benchmarks.datasets as datasets
+except ModuleNotFoundError:
+    import datasets
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = os.path.join(BENCHMARK_DIR, 'data')
+RESULTS_DIR = os.path.join(BENCHMARK_DIR, 'results')
+SIZES = [1000, 10000, 100000]
+MEMORY_SAMPLE = 10000
+JOBS = os.cpu_count() or 1
+
+
+class StageRunner(object):
+
+    def __init__(self, workbook: str, workdir: str, jobs: int = JOBS):
+        self.workbook = workbook
+        self.workdir = workdir
+        self.jobs = jobs
+        self.rows = list(xls2bm.iter_input_rows(workbook))
+        self.bookmarks = self.construct_bookmarks()
+        self.csv_file = xls2bm.write_output_files(
+            os.path.join(workdir, 'input'), self.get_output_rows(),
+            limit=len(self.rows) + 1)[0]
+
+    def get_output_rows(self):
+        return (xls2bm.get_output_row(bm.to_string())
+                for bm in self.bookmarks)
+
+    def get_stages(self):
+        return [
+            ('xls2bm.read_input_file', self.read_excel),
+            ('xlsx_read', self.read_rows),
+            ('bookmark_construction', self.construct_bookmarks),
+            ('bookmark_construction_processes', functools.partial(
+                self.construct_bookmarks_in, 'process')),
+            # Only scales on free-threaded builds; with the GIL it shows
+            # the cost of the thread pool
+            ('bookmark_construction_threads', functools.partial(
+                self.construct_bookmarks_in, 'thread')),
+            ('shelf_admission', self.admit_bookmarks),
+            ('csv_export', self.export_csv),
+            ('bm2xls.read_input_file', self.read_csv),
+            ('workbook_save', self.save_workbook),
+            ('streamed_conversion', self.convert_streamed),
+            # Reading, validation and writing overlap in three threads
+            ('pipelined_conversion', self.convert_pipelined)
+        ]
+
+    def read_excel(self):
+        xls2bm.read_input_file(os.path.splitext(self.workbook)[0])
+
+    def read_rows(self):
+        return list(xls2bm.iter_input_rows(self.workbook))
+
+    def construct_bookmarks(self):
+        context = bookmark.ValidationContext()
+        return [bookmark.Bookmark.from_row(row, context)
+                for row in self.rows]
+
+    def construct_bookmarks_in(self, executor: str):
+        return [bm for bm, _, _ in xls2bm.iter_built_bookmarks(
+            self.rows, None, self.jobs, executor=executor)]
+
+    def admit_bookmarks(self):
+        shelf = bookmark_shelf.BookmarkShelf()
+        for bm in self.bookmarks:
+            shelf.add_bookmark(bm)
+
+    def export_csv(self):
+        filenames = xls2bm.write_output_files(
+            os.path.join(self.workdir, 'output'), self.get_output_rows())
+        for filename in filenames:
+            os.remove(filename)
+
+    def convert_streamed(self):
+        my_shelf = bookmark_shelf.BookmarkShelf(keep_bookmarks=False)
+        rows = xls2bm.iter_admitted_bookmarks(
+            xls2bm.iter_input_rows(self.workbook), my_shelf)
+        filenames = xls2bm.write_output_files(
+            os.path.join(self.workdir, 'streamed'),
+            (xls2bm.get_output_row(bm.to_string()) for bm in rows))
+        for filename in filenames:
+            os.remove(filename)
+
+    def convert_pipelined(self):
+        # run_pipeline writes next to the workbook it reads
+        name = os.path.join(self.workdir, 'pipelined')
+        if not os.path.exists('{}.xlsx'.format(name)):
+            shutil.copyfile(self.workbook, '{}.xlsx'.format(name))
+        for filename in xls2bm.run_pipeline(name, pipeline.Pipeline()):
+            os.remove(filename)
+
+    def read_csv(self):
+        bm2xls.read_input_file(self.csv_file)
+
+    def save_workbook(self):
+        filename = os.path.join(self.workdir, 'output.xlsx')
+        bm2xls.write_workbook(
+            filename, 'Bookmarks', bm2xls.iter_input_rows(self.csv_file))
+        os.remove(filename)
+
+
+class DictBookmark(object):
+
+    # Layout of a bookmark with a per-instance __dict__, as before Bookmark
+    # had slots; kept to report the memory before and after
+    def __init__(self, bm: bookmark.Bookmark):
+        for name in bookmark.Bookmark.get_fields():
+            setattr(self, name, getattr(bm, name))
+
+
+def get_bookmarks(rows: list, shared_context: bool = True):
+    if not shared_context:
+        # One context per row: nothing is interned across rows
+        return [bookmark.Bookmark.from_row(row) for row in rows]
+    context = bookmark.ValidationContext()
+    return [bookmark.Bookmark.from_row(row, context) for row in rows]
+
+
+LAYOUTS = [
+    ('bookmark_dict', lambda rows: [
+        DictBookmark(bm) for bm in get_bookmarks(rows)]),
+    ('bookmark_uninterned', lambda rows: get_bookmarks(rows, False)),
+    ('bookmark', get_bookmarks),
+    ('record', lambda rows: [
+        bookmark.BookmarkRecord.from_bookmark(bm)
+        for bm in get_bookmarks(rows)])
+]
+
+
+def get_allocated_size(items: list):
+    # Sums the items and the objects reachable from them that were
+    # allocated while tracemalloc was tracing; interpreter tables such as
+    # the sys.intern dictionary and the caches of the validation are not
+    # reachable. Instances with a managed __dict__ have no traceback, so
+    # the items are counted without checking it, and their __dict__ is
+    # created to count the values kept in the instance.
+    retval = sys.getsizeof(items)
+    seen = set(map(id, items))
+    pending = []
+    for item in items:
+        getattr(item, '__dict__', None)
+        retval += sys.getsizeof(item)
+        pending.extend(gc.get_referents(item))
+    while pending:
+        obj = pending.pop()
+        if id(obj) in seen or tracemalloc.get_object_traceback(obj) is None:
+            continue
+        seen.add(id(obj))
+        retval += sys.getsizeof(obj)
+        pending.extend(gc.get_referents(obj))
+    return retval
+
+
+def measure_layout(workbook: str, name: str, memory_sample: int):
+    # Bytes kept alive per bookmark, not counting the input rows
+    rows = list(itertools.islice(
+        xls2bm.iter_input_rows(workbook), memory_sample or None))
+    build = dict(LAYOUTS)[name]
+    gc.collect()
+    tracemalloc.start()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            items = build(rows)
+        return get_allocated_size(items) / len(items)
+    finally:
+        tracemalloc.stop()
+
+
+def measure_memory(workbook: str, memory_sample: int = MEMORY_SAMPLE):
+    # Each layout is measured in a fresh interpreter, so the layouts
+    # measured before do not change the result
+    retval = {}
+    for name, _ in LAYOUTS:
+        output = subprocess.run(
+            [sys.executable, '-m', 'benchmarks.bench_pipeline',
+             '--measure-layout', name, '--workbook', workbook,
+             '--memory-sample', str(memory_sample)],
+            capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(BENCHMARK_DIR)).stdout
+        retval[name] = float(output)
+    return retval
+
+
+def run_stage(stage, repeat: int):
+    runs = []
+    for _ in range(repeat):
+        # Notices of the validation must not end up in the timings
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            stage()
+            runs.append(time.perf_counter() - start)
+    return {
+        'min': min(runs),
+        'median': statistics.median(runs),
+        'runs': runs
+    }
+
+
+def run_benchmarks(sizes: list, repeat: int, stages: list = None,
+                   memory: dict = None, memory_sample: int = MEMORY_SAMPLE,
+                   jobs: int = JOBS):
+    results = {}
+    with tempfile.TemporaryDirectory(prefix='ebm_bench_') as workdir:
+        for size in sizes:
+            runner = StageRunner(
+                datasets.get_workbook(DATA_DIR, size), workdir, jobs)
+            results[str(size)] = {}
+            for name, stage in runner.get_stages():
+                if stages and name not in stages:
+                    continue
+                results[str(size)][name] = run_stage(stage, repeat)
+                print('{:>7} rows  {:<32} {:9.3f} s'.format(
+                    size, name, results[str(size)][name]['min']))
+            if memory is not None:
+                memory[str(size)] = measure_memory(
+                    runner.workbook, memory_sample)
+                for name, size_in_bytes in memory[str(size)].items():
+                    print('{:>7} rows  {:<32} {:9.0f} bytes/bookmark'.format(
+                        size, name, size_in_bytes))
+    return results
+
+
+def get_commit():
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+            text=True, check=True, cwd=BENCHMARK_DIR).stdout.strip()
+        dirty = subprocess.run(
+            ['git', 'status', '--porcelain', '--untracked-files=no'],
+            capture_output=True, text=True, check=True,
+            cwd=BENCHMARK_DIR).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+    return '{}-dirty'.format(commit) if dirty else commit
+
+
+def save_results(results: dict, commit: str, directory: str = RESULTS_DIR,
+                 memory: dict = None, jobs: int = JOBS):
+    os.makedirs(directory, exist_ok=True)
+    filename = os.path.join(directory, '{}.json'.format(commit))
+    with open(filename, 'w', encoding='utf-8') as outputfile:
+        json.dump({
+            'commit': commit,
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'gil_enabled': utils.is_gil_enabled(),
+            'jobs': jobs,
+            'results': results,
+            'memory': memory or {}
+        }, outputfile, indent=2)
+    return filename
+
+
+def load_results(reference: str, directory: str = RESULTS_DIR):
+    filename = reference
+    if not os.path.exists(filename):
+        filename = os.path.join(directory, '{}.json'.format(reference))
+    with open(filename, encoding='utf-8') as inputfile:
+        return json.load(inputfile)
+
+
+def compare_results(results: dict, reference: dict, threshold: float,
+                    memory: dict = None):
+    regressions = 0
+    print('\nCompared with {}:'.format(reference['commit']))
+    for size, stages in results.items():
+        for name, timing in stages.items():
+            try:
+                before = reference['results'][size][name]['min']
+            except KeyError:
+                continue
+            ratio = timing['min'] / before if before else float('inf')
+            flag = ''
+            if ratio > threshold:
+                flag = '  REGRESSION'
+                regressions += 1
+            print('{:>7} rows  {:<32} {:9.3f} s -> {:9.3f} s  x{:.2f}{}'
+                  .format(size, name, before, timing['min'], ratio, flag))
+    for size, layouts in (memory or {}).items():
+        for name, size_in_bytes in layouts.items():
+            try:
+                before = reference['memory'][size][name]
+            except KeyError:
+                continue
+            print('{:>7} rows  {:<32} {:9.0f} B -> {:9.0f} B  x{:.2f}'.format(
+                size, name, before, size_in_bytes, size_in_bytes / before))
+    return regressions
+
+
+def main(argv: list = None):
+    parser = argparse.ArgumentParser(
+        description='Time every stage of the bookmark conversion pipeline')
+    parser.add_argument(
+        '--sizes', type=int, nargs='+', default=SIZES,
+        help='Number of synthetic bookmarks per dataset')
+    parser.add_argument(
+        '--repeat', type=int, default=3,
+        help='Number of runs per stage; the fastest run is compared')
+    parser.add_argument(
+        '--stage', action='append', dest='stages',
+        help='Run only the given stage; can be used more than once')
+    parser.add_argument(
+        '--compare', metavar='COMMIT_OR_FILE',
+        help='Compare with the results stored for a commit or in a file')
+    parser.add_argument(
+        '--threshold', type=float, default=1.1,
+        help='Slowdown factor reported as regression')
+    parser.add_argument(
+        '--no-save', action='store_true',
+        help='Do not store the results')
+    parser.add_argument(
+        '--no-memory', action='store_true',
+        help='Do not measure the bytes per bookmark')
+    parser.add_argument(
+        '--memory-sample', type=int, default=MEMORY_SAMPLE,
+        help='Number of rows measured per dataset; 0 measures all rows')
+    parser.add_argument(
+        '--jobs', type=int, default=JOBS,
+        help='Number of processes or threads of the parallel stages')
+    parser.add_argument('--measure-layout', help=argparse.SUPPRESS)
+    parser.add_argument('--workbook', help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    if args.measure_layout:
+        print(measure_layout(
+            args.workbook, args.measure_layout, args.memory_sample))
+        return 0
+    memory = None if args.no_memory else {}
+    results = run_benchmarks(args.sizes, args.repeat, args.stages, memory,
+                             args.memory_sample, args.jobs)
+    if not args.no_save:
+        print('\nResults stored in {}'.format(save_results(
+            results, get_commit(), memory=memory, jobs=args.jobs)))
+    if args.compare:
+        if compare_results(results, load_results(args.compare),
+                           args.threshold, memory):
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
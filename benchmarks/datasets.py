@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# The MIT License (MIT)
+#
+# Copyright (c) 2025, Roland Rickborn (r_2@gmx.net)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+# ---------------------------------------------------------------------------
+
+import datetime as dt
+import json
+import os
+import random
+import uuid
+
+import openpyxl
+
+import src.ebm.bookmark as bookmark
+
+COUNTRIES = [
+    'de', 'us', 'gb', 'fr', 'it', 'es', 'nl', 'at', 'ch', 'be', 'pl', 'se',
+    'no', 'dk', 'fi', 'ie', 'pt', 'cz', 'hu', 'ro', 'in', 'cn', 'jp', 'br',
+    'ca', 'au', 'mx', 'za', 'sg', 'kr']
+DEVICES = ['pc-windows', 'pc-mac', 'mobile-android', 'mobile-ios']
+WORDS = [
+    'payroll', 'travel', 'expense', 'holiday', 'vpn', 'printer', 'helpdesk',
+    'benefits', 'canteen', 'parking', 'wiki', 'intranet', 'security', 'hr',
+    'it', 'finance', 'sales', 'crm', 'erp', 'timesheet', 'onboarding',
+    'training', 'policy', 'laptop', 'phone', 'password', 'mail', 'teams',
+    'sharepoint', 'onedrive', 'facilities', 'legal', 'procurement', 'badge']
+CATEGORIES = ['IT', 'HR', 'Finance', 'Facilities', 'Communication']
+
+
+def get_keyword(rnd: random.Random, vocabulary: int):
+    # Keyword popularity follows a long tail like in real tenants
+    n = int(rnd.paretovariate(1.2)) % vocabulary
+    return '{} {}'.format(WORDS[n % len(WORDS)], n // len(WORDS))
+
+
+def get_variations(rnd: random.Random, i: int):
+    return json.dumps([{
+        'title': 'Variation {} of {}'.format(j, i),
+        'description': 'Localized bookmark',
+        'url': 'https://{}.portal-{}.example.com/start'.format(
+            country, i % 50),
+        'device': ';'.join(rnd.sample(DEVICES, rnd.randint(1, 2))),
+        'country': country
+    } for j, country in enumerate(rnd.sample(COUNTRIES, rnd.randint(1, 3)))],
+        separators=(',', ':'))
+
+
+def generate_rows(size: int, seed: int = 0):
+    rnd = random.Random(seed)
+    now = dt.datetime.now().replace(microsecond=0)
+    vocabulary = max(size // 2, len(WORDS))
+    groups = [str(uuid.UUID(int=rnd.getrandbits(128), version=4))
+              for _ in range(200)]
+    for i in range(size):
+        state = rnd.choices(
+            ['published', 'draft', 'scheduled'], [80, 15, 5])[0]
+        if state == 'draft':
+            title = 'Draft {}'.format(i % 97)
+        else:
+            title = 'Bookmark {}'.format(i)
+        keywords = [get_keyword(rnd, vocabulary)
+                    for _ in range(rnd.choices(range(1, 7),
+                                               [30, 30, 20, 10, 6, 4])[0])]
+        keywords.append('bookmark {}'.format(i))
+        start_date = None
+        end_date = None
+        if state == 'scheduled' or rnd.random() < 0.1:
+            # Far enough ahead to keep cached workbooks valid for years
+            start_date = now + dt.timedelta(days=rnd.randint(730, 1000))
+            end_date = start_date + dt.timedelta(days=rnd.randint(1, 365))
+        yield [
+            title,
+            'https://intranet-{}.example.com/apps/{}?id={}'.format(
+                i % 20, rnd.choice(WORDS), i),
+            ';'.join(keywords),
+            rnd.choice(['true', 'false', None]),
+            state,
+            rnd.choice([None, 'Start page of {}'.format(title)]),
+            'reserved {}'.format(i) if rnd.random() < 0.1 else None,
+            rnd.choice(CATEGORIES) if rnd.random() < 0.3 else None,
+            start_date,
+            end_date,
+            ';'.join(rnd.sample(COUNTRIES, rnd.randint(1, 4)))
+            if rnd.random() < 0.35 else None,
+            rnd.choice(['True', 'False']),
+            ';'.join(rnd.sample(groups, rnd.randint(1, 4)))
+            if rnd.random() < 0.25 else None,
+            ';'.join(rnd.sample(DEVICES, rnd.randint(1, 3)))
+            if rnd.random() < 0.2 else None,
+            get_variations(rnd, i) if rnd.random() < 0.1 else None,
+            now - dt.timedelta(days=rnd.randint(0, 900)),
+            'user{}@example.com'.format(rnd.randint(1, 40)),
+            str(uuid.UUID(int=rnd.getrandbits(128), version=4))
+        ]
+
+
+def write_workbook(filename: str, rows):
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet('Bookmarks')
+    ws.append(list(bookmark.Bookmark.get_columns().values()))
+    for row in rows:
+        ws.append(row)
+    wb.save(filename)
+
+
+def get_workbook(directory: str, size: int, seed: int = 0):
+    filename = os.path.join(directory, 'bookmarks_{}_{}.xlsx'.format(
+        size, seed))
+    if not os.path.exists(filename):
+        os.makedirs(directory, exist_ok=True)
+        write_workbook(filename, generate_rows(size, seed))
+    return filename
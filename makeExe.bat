@@ -75,7 +75,7 @@ if %ERRORLEVEL% == 0 (
         --name enterprise_bookmarks_manager ^
         --hidden-import openpyxl ^
         --hidden-import validators ^
-        --hidden-import pycountry ^
+        --exclude-module pycountry ^
         --add-data %cd%\src\ebm\*.py;src\ebm\ ^
         src/ebm/enterprise_bookmarks_manager.py
     GOTO :CHECKSUM
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# The MIT License (MIT)
+#
+# Copyright (c) 2025, Roland Rickborn (r_2@gmx.net)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+# ---------------------------------------------------------------------------
+
+import argparse
+import importlib.metadata
+import os
+import sys
+
+import pycountry
+
+OUTPUT_FILENAME = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    'src', 'ebm', 'country_codes.py')
+
+
+def get_license_header():
+    # The generated module carries the same header as this script
+    with open(__file__, encoding='utf-8') as inputfile:
+        lines = inputfile.read().split('\n')
+    return '\n'.join(lines[:lines.index('# ' + '-' * 75)])
+
+
+def render():
+    lines = [
+        get_license_header(),
+        '# Generated by scripts/generate_country_codes.py - do not edit',
+        '#',
+        '# ' + '-' * 75,
+        '',
+        'PYCOUNTRY_VERSION = {!r}'.format(
+            importlib.metadata.version('pycountry')),
+        '',
+        'COUNTRIES = ('
+    ]
+    for country in pycountry.countries:
+        lines.append('    ({!r}, {!r}),'.format(
+            country.alpha_2.lower(), country.name))
+    lines.append(')')
+    return '\n'.join(lines) + '\n'
+
+
+def main(argv: list = None):
+    parser = argparse.ArgumentParser(
+        description='Generates the country table of src/ebm/country_codes.py '
+                    'from the installed pycountry')
+    parser.add_argument(
+        '--check', action='store_true',
+        help='Exit with 1 if the table is not up to date')
+    args = parser.parse_args(argv)
+    content = render()
+    if args.check:
+        with open(OUTPUT_FILENAME, encoding='utf-8') as inputfile:
+            if inputfile.read() != content:
+                print('{} is not up to date'.format(OUTPUT_FILENAME))
+                return 1
+        return 0
+    with open(OUTPUT_FILENAME, 'w', encoding='utf-8', newline='\n') as f:
+        f.write(content)
+    print('Output file: {}'.format(OUTPUT_FILENAME))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
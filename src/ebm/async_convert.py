@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# The MIT License (MIT)
+#
+# Copyright (c) 2025, Roland Rickborn (r_2@gmx.net)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+# ---------------------------------------------------------------------------
+
+import asyncio
+import functools
+import inspect
+import io
+import threading
+
+try:
+    import src.ebm.bm2xls as bm2xls
+    import src.ebm.bookmark as bookmark
+    import src.ebm.bookmark_shelf as bookmark_shelf
+    import src.ebm.xls2bm as xls2bm
+except ModuleNotFoundError:
+    import bm2xls
+    import bookmark
+    import bookmark_shelf
+    import xls2bm
+
+READ_SIZE = 65536
+PROGRESS_ROWS = 500
+
+
+class ConversionCancelled(Exception):
+    pass
+
+
+class ProgressEvent(object):
+
+    # stage is 'read' (count is the number of bytes read), 'notice'
+    # (message holds the notice of a row), 'rows' (count is the number of
+    # rows converted so far) or 'done' (result holds the output)
+    def __init__(self, stage: str, count: int = 0, message: str = None,
+                 result=None):
+        self.stage = stage
+        self.count = count
+        self.message = message
+        self.result = result
+
+    def __repr__(self):
+        return 'ProgressEvent({!r}, {!r})'.format(self.stage, self.count)
+
+
+async def read_stream(stream, executor=None):
+    # Accepts bytes, asyncio streams and other objects with a coroutine
+    # read(); the blocking read() of plain file objects runs in the
+    # executor
+    if isinstance(stream, (bytes, bytearray, memoryview)):
+        return bytes(stream)
+    loop = asyncio.get_running_loop()
+    if inspect.iscoroutinefunction(stream.read):
+        read = stream.read
+    else:
+        async def read(size):
+            return await loop.run_in_executor(executor, stream.read, size)
+    chunks = []
+    while True:
+        chunk = await read(READ_SIZE)
+        if not chunk:
+            return b''.join(chunks)
+        chunks.append(chunk)
+
+
+class Converter(object):
+
+    # Runs a blocking conversion in an executor thread. Events are handed
+    # to the event loop thread-safely; the conversion checks for
+    # cancellation every PROGRESS_ROWS rows.
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self.loop = loop
+        self.events = asyncio.Queue()
+        self.cancelled = threading.Event()
+
+    def emit(self, event: ProgressEvent):
+        self.loop.call_soon_threadsafe(self.events.put_nowait, event)
+
+    def iter_counted(self, rows):
+        count = 0
+        for row in rows:
+            yield row
+            count += 1
+            if count % PROGRESS_ROWS == 0:
+                if self.cancelled.is_set():
+                    raise ConversionCancelled()
+                self.emit(ProgressEvent('rows', count))
+        self.emit(ProgressEvent('rows', count))
+
+    def excel_to_csv(self, data: bytes, jobs: int, limit: int):
+        context = bookmark.ValidationContext(
+            notices=[], cache_size=xls2bm.CACHE_SIZE)
+        my_shelf = bookmark_shelf.BookmarkShelf(keep_bookmarks=False)
+        bookmarks = xls2bm.iter_admitted_bookmarks(
+            xls2bm.iter_input_rows(io.BytesIO(data)), my_shelf, jobs=jobs,
+            context=context)
+
+        def iter_output_rows():
+            for bm in bookmarks:
+                for notice in context.notices:
+                    self.emit(ProgressEvent('notice', message=notice))
+                context.notices.clear()
+                yield xls2bm.get_output_row(bm.to_string())
+
+        return [
+            csv_file.getvalue().encode('utf-8')
+            for csv_file in xls2bm.write_output_streams(
+                self.iter_counted(iter_output_rows()), limit=limit)]
+
+    def csv_to_excel(self, data: bytes, title: str):
+        rows = bm2xls.iter_csv_rows(
+            io.StringIO(data.decode('utf-8'), newline=''))
+        output = io.BytesIO()
+        bm2xls.write_workbook(output, title, self.iter_counted(rows))
+        return output.getvalue()
+
+    async def iter_events(self, convert, executor=None):
+        future = self.loop.run_in_executor(executor, convert)
+        get = None
+        try:
+            while not future.done():
+                get = asyncio.ensure_future(self.events.get())
+                done, _ = await asyncio.wait(
+                    {get, future}, return_when=asyncio.FIRST_COMPLETED)
+                if get in done:
+                    yield get.result()
+                else:
+                    get.cancel()
+            # Events are queued before the result is set, so the ones of
+            # the last rows are already here
+            while not self.events.empty():
+                yield self.events.get_nowait()
+            yield ProgressEvent('done', result=future.result())
+        finally:
+            if get is not None:
+                get.cancel()
+            if not future.done():
+                # The caller was cancelled or stopped iterating: the
+                # conversion stops at its next check, which is awaited so
+                # no work is left running in the executor. Its outcome
+                # must not replace the exception that is propagating.
+                self.cancelled.set()
+                try:
+                    await asyncio.shield(future)
+                except Exception:
+                    pass
+
+
+async def iter_excel_to_csv(stream, *, jobs: int = 1, limit: int = 3000,
+                            executor=None):
+    data = await read_stream(stream, executor)
+    yield ProgressEvent('read', len(data))
+    converter = Converter(asyncio.get_running_loop())
+    async for event in converter.iter_events(functools.partial(
+            converter.excel_to_csv, data, jobs, limit), executor):
+        yield event
+
+
+async def iter_csv_to_excel(stream, *, title: str = 'Bookmarks',
+                            executor=None):
+    data = await read_stream(stream, executor)
+    yield ProgressEvent('read', len(data))
+    converter = Converter(asyncio.get_running_loop())
+    async for event in converter.iter_events(functools.partial(
+            converter.csv_to_excel, data, title), executor):
+        yield event
+
+
+async def run_events(events, progress=None):
+    try:
+        async for event in events:
+            if event.stage == 'done':
+                return event.result
+            if progress is not None:
+                progress(event)
+    finally:
+        await events.aclose()
+
+
+async def convert_excel_to_csv(stream, *, jobs: int = 1, limit: int = 3000,
+                               executor=None, progress=None):
+    # Returns the content of each CSV file of at most limit rows
+    return await run_events(iter_excel_to_csv(
+        stream, jobs=jobs, limit=limit, executor=executor), progress)
+
+
+async def convert_csv_to_excel(stream, *, title: str = 'Bookmarks',
+                               executor=None, progress=None):
+    # Returns the content of the workbook
+    return await run_events(iter_csv_to_excel(
+        stream, title=title, executor=executor), progress)
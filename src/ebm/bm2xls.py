@@ -27,39 +27,81 @@
 
 import csv
 import datetime as dt
-import locale
+import io
 import sys
 
 import openpyxl
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.utils import get_column_letter
 
 try:
     import src.ebm.bookmark as bookmark
+    import src.ebm.date_codec as date_codec
     import src.ebm.utils as utils
 except ModuleNotFoundError:
     import bookmark
+    import date_codec
     import utils
 
+# State, Categories, Country/Region, Groups and Device & OS repeat a few
+# distinct cells across the whole file
+SHARED_COLUMNS = ['E', 'H', 'K', 'M', 'N']
+SHARED_CELLS = 10000
+
+
+def iter_input_rows(input_filename: str):
+    with open(input_filename, newline='', encoding='utf-8') as csv_file:
+        yield from iter_csv_rows(csv_file)
+
+
+def iter_csv_rows(csv_file):
+    csv_reader = csv.reader(csv_file, delimiter=',')
+    header = next(csv_reader, None)
+    if header is None:
+        return
+    if not validate_header(header):
+        raise ValidationError('Header of CSV file not correct')
+    yield tuple(header)
+    yield from iter_unique_ids(iter_shared_cells(csv_reader), len(header))
+
+
+def iter_shared_cells(rows):
+    # Equal cells of the shared columns become one string object
+    indexes = [
+        index for index, key in enumerate(bookmark.Bookmark.get_columns())
+        if key in SHARED_COLUMNS]
+    context = bookmark.ValidationContext(cache_size=SHARED_CELLS)
+    for row in rows:
+        for index in indexes:
+            if index < len(row):
+                row[index] = context.intern(row[index])
+        yield row
+
+
+def iter_unique_ids(rows, width: int):
+    ids = set()
+    id_index = len(bookmark.Bookmark.get_columns()) - 1
+    for row in rows:
+        if len(row) == 0:
+            continue
+        if len(row) > width:
+            raise ValidationError(
+                'Row of CSV file has more columns than its header')
+        if len(row) > id_index and row[id_index] != '':
+            if row[id_index] in ids:
+                raise ValidationError(
+                    'The Id \'{}\' exists more than once'.format(
+                        row[id_index]))
+            ids.add(row[id_index])
+        yield tuple(row)
+
 
 def read_input_file(input_filename: str):
     retval = {}
-    my_output_columns = bookmark.Bookmark.get_columns()
-    header_row_keys = list(my_output_columns.keys())
-    header_checked = False
+    header_row_keys = list(bookmark.Bookmark.get_columns().keys())
     try:
-        with open(input_filename, newline='', encoding='utf-8') as csv_file:
-            csv_reader = csv.reader(csv_file, delimiter=',')
-            for row in csv_reader:
-                if not header_checked:
-                    if validate_header(row):
-                        header_checked = True
-                    else:
-                        raise ValidationError(
-                            'Header of CSV file not correct')
-                t = {}
-                id = row[-1]
-                for col in range(0, len(row)):
-                    t[header_row_keys[col]] = row[col]
-                retval[id] = t
+        for row in iter_input_rows(input_filename):
+            retval[row[-1]] = dict(zip(header_row_keys, row))
         return retval
     except FileNotFoundError as e:
         print(e)
@@ -78,78 +120,115 @@ def validate_header(header_row: list):
 
 
 def get_date_by_str(datetimestr: str):
-    retval = ''
-    if 'T' in datetimestr and '+' in datetimestr:
-        try:
-            d = dt.datetime.strptime(datetimestr+'00', '%Y-%m-%dT%H:%M:%S%z')
-            retval = d.replace(tzinfo=None)
-        except Exception:
-            retval = datetimestr
-    else:
-        try:
-            d = dt.datetime.strptime(datetimestr, '%m/%d/%Y')
-            retval = d.replace(tzinfo=None)
-        except Exception:
-            retval = datetimestr
-    return retval
+    return date_codec.parse(datetimestr)
 
 
 def get_date_format_by_str(datetimestr: str):
-    retval = ''
-    loc = locale.getlocale()
-    if 'T' in datetimestr and '+' in datetimestr:
-        if loc[0].startswith('de'):
-            retval = 'dd.mm.yyyy HH:MM:SS'
-        else:
-            retval = 'mm/dd/yyyy HH:MM:SS'
-    elif '/' in datetimestr:
-        if loc[0].startswith('de'):
-            retval = 'dd.mm.yyyy'
-        else:
-            retval = 'mm/dd/yyyy'
-    return retval
+    return date_codec.get_number_format(
+        datetimestr, date_codec.get_number_formats())
+
+
+class WorkbookStyles(object):
+
+    def __init__(self, wb: openpyxl.Workbook):
+        self.wb = wb
+        self.header = openpyxl.styles.NamedStyle(
+            name='Bookmark Header', font=openpyxl.styles.Font(bold=True))
+        self.wb.add_named_style(self.header)
+        self.dates = {}
+
+    def get_date_style(self, number_format: str):
+        if number_format not in self.dates:
+            style = openpyxl.styles.NamedStyle(
+                name='Bookmark Date {}'.format(number_format),
+                number_format=number_format)
+            self.wb.add_named_style(style)
+            self.dates[number_format] = style.name
+        return self.dates[number_format]
+
+
+def write_workbook(output_filename: str, title: str, rows):
+    wb = openpyxl.Workbook(write_only=True)
+    wb.iso_dates = True
+    ws = wb.create_sheet(title)
+    styles = WorkbookStyles(wb)
+    number_formats = date_codec.get_number_formats()
+    date_columns = [
+        index for index, cell_char in enumerate(
+            bookmark.Bookmark.get_columns()) if cell_char in ['I', 'J', 'P']]
+    max_col = 1
+    max_row = 0
+    try:
+        for row in rows:
+            max_row += 1
+            max_col = max(max_col, len(row))
+            if max_row == 1:  # Write header line
+                cells = []
+                for value in row:
+                    cell = WriteOnlyCell(ws, value=value)
+                    cell.style = styles.header.name
+                    cells.append(cell)
+                ws.append(cells)
+                continue
+            # Empty strings are stored like missing cells, so they are not
+            # written at all
+            cells = [value if value != '' else None for value in row]
+            for index in date_columns:  # Detect datetime objects
+                if index >= len(cells) or cells[index] is None:
+                    continue
+                my_date = get_date_by_str(cells[index])
+                if isinstance(my_date, dt.datetime):
+                    cell = WriteOnlyCell(ws, value=my_date)
+                    cell.style = styles.get_date_style(
+                        date_codec.get_number_format(
+                            cells[index], number_formats))
+                    cells[index] = cell
+                else:
+                    cells[index] = my_date
+            ws.append(cells)
+    except Exception:
+        # Finish the sheet's temporary file so it can be cleaned up
+        ws.close()
+        raise
+    ws.auto_filter.ref = 'A1:{}{}'.format(
+        get_column_letter(max_col), max(max_row, 1))
+    wb.save(output_filename)
 
 
 def convert_csv_to_excel(filename: str):
+    new_filename = utils.get_save_filename('{}.xlsx'.format(filename))
     try:
-        my_input_data = read_input_file('{}.csv'.format(filename))
+        with open('{}.csv'.format(filename), newline='',
+                  encoding='utf-8') as input_file:
+            convert_csv_stream(
+                input_file, new_filename, filename.split('\\')[-1])
     except ValidationError as e:
         print(e)
         sys.exit(1)
-    wb = openpyxl.Workbook()
-    wb.iso_dates = True
-    ws = wb.active
-    ws.title = filename.split('\\')[-1]
-    my_input_data_keys = list(my_input_data.keys())
-    for item in range(0, len(my_input_data_keys)):
-        bookmark_id = my_input_data_keys[item]
-        cell_number = item+1
-        cell_chars = list(my_input_data[bookmark_id].keys())
-        for cell_char in cell_chars:
-            if cell_number == 1:  # Write header line
-                ws['{}{}'.format(cell_char, cell_number)] = my_input_data[
-                    bookmark_id][cell_char]
-                ws['{}{}'.format(
-                    cell_char, cell_number)].font = openpyxl.styles.Font(
-                        bold=True)
-            elif cell_char in ['I', 'J', 'P']:  # Detect datetime objects
-                my_date = get_date_by_str(
-                    my_input_data[bookmark_id][cell_char])
-                ws['{}{}'.format(cell_char, cell_number)] = my_date
-                if isinstance(my_date, dt.datetime):
-                    my_date_format = get_date_format_by_str(
-                        my_input_data[bookmark_id][cell_char])
-                    ws['{}{}'.format(
-                        cell_char, cell_number)].number_format = my_date_format
-            else:
-                ws['{}{}'.format(
-                    cell_char, cell_number)] = my_input_data[bookmark_id][
-                        cell_char]
-    ws.auto_filter.ref = ws.dimensions
-    new_filename = utils.get_save_filename('{}.xlsx'.format(filename))
-    wb.save(new_filename)
+    except FileNotFoundError as e:
+        print(e)
+        sys.exit(2)
     return new_filename
 
 
+def convert_csv_stream(input_file, output_file=None,
+                       title: str = 'Bookmarks'):
+    # input_file is a text or binary stream of UTF-8 CSV; the workbook is
+    # written to output_file, a binary stream or a filename, or else into
+    # a BytesIO object. Returns where the workbook was written.
+    if output_file is None:
+        output_file = io.BytesIO()
+    if isinstance(input_file, io.TextIOBase):
+        write_workbook(output_file, title, iter_csv_rows(input_file))
+        return output_file
+    text_file = io.TextIOWrapper(input_file, encoding='utf-8', newline='')
+    try:
+        write_workbook(output_file, title, iter_csv_rows(text_file))
+    finally:
+        # Leaves the binary stream of the caller open
+        text_file.detach()
+    return output_file
+
+
 class ValidationError(Exception):
     pass
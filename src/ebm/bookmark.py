@@ -25,22 +25,47 @@
 #
 # ---------------------------------------------------------------------------
 
+import collections
+import copy
 import datetime
+import functools
+import itertools
 import json
-import re
+import operator
+import sys
 import urllib.parse
 
-import validators
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 try:
+    import src.ebm.date_codec as date_codec
     import src.ebm.enums as enums
+    import src.ebm.validation as validation
 except ModuleNotFoundError:
+    import date_codec
     import enums
+    import validation
+
+URL_CACHE_SIZE = 4096
 
 
 class Bookmark(object):
 
-    def __init__(self, title: str, url: str, keywords: str, **kwargs):
+    __slots__ = (
+        'title', 'url', 'keywords', 'match_similar_keywords', 'state',
+        'description', 'reserved_keywords', 'categories', 'start_date',
+        'end_date', 'country_region', 'use_aad_location', 'groups',
+        'device_and_os', 'targeted_variations', 'last_modified',
+        'last_modified_by', 'id')
+
+    _schema = None
+    _serializer = None
+
+    def __init__(self, title: str, url: str, keywords: str, *,
+                 context=None, **kwargs):
 
         # Class variables with default values
         self.title = ''
@@ -62,239 +87,426 @@ class Bookmark(object):
         self.last_modified_by = None
         self.id = None
 
-        if self.validate_title(title):
-            self.title = title
-        else:
-            self.title = '{}...'.format(title[:57])
-            print('Title has been shortened to \'{}\''.format(self.title))
+        if context is None:
+            context = ValidationContext()
+        kwargs['title'] = title
+        kwargs['url'] = url
+        kwargs['keywords'] = keywords
+
+        # Fields are checked cheap-first, but the error reported is always
+        # the one of the left-most failing column, as if the columns had
+        # been checked from A to R. Once a column failed, only columns to
+        # its left still need to be checked.
+        failure = None
+        notices = []
+        for spec in self.get_schema():
+            if spec.name not in kwargs:
+                continue
+            if failure is not None and spec.index > failure[0]:
+                continue
+            value = kwargs[spec.name]
+            try:
+                parsed = spec.parse(value, context)
+            except InvalidFieldError:
+                failure = (spec.index, ValidationError(
+                    spec.message.format(self.title)))
+                continue
+            except Exception as e:
+                failure = (spec.index, e)
+                continue
+            setattr(self, spec.name, parsed)
+            if spec.notice is not None and parsed is not value:
+                notices.append((spec.index, spec.notice.format(parsed)))
+
+        for index, notice in sorted(notices):
+            if failure is None or index < failure[0]:
+                context.notify(notice)
+        if failure is not None:
+            raise failure[1]
+
+        error = self.check_cross_fields(
+            self.title, self.state, self.start_date, self.end_date,
+            self.keywords, self.reserved_keywords, context.now)
+        if error is not None:
+            raise error
 
-        if self.validate_url(url):
-            self.url = url
-        else:
-            raise ValidationError(
-                'URL of \'{}\' could not be validated'.format(self.title))
+    @classmethod
+    def check_cross_fields(cls, title, state, start_date, end_date, keywords,
+                           reserved_keywords, now=None):
+        if not cls.validate_start_end_dates(start_date, end_date, now):
+            return ValidationError(
+                'Start Date/End Date of \'{}\' could not be validated'.format(
+                    title))
 
-        if self.validate_keywords(
-                self.remove_duplicates(self.get_serialized_values(keywords))):
-            self.keywords = self.remove_duplicates(
-                self.get_serialized_values(keywords))
-        else:
-            raise ValidationError(
-                'Keywords of \'{}\' could not be validated'.format(self.title))
-
-        if 'match_similar_keywords' in kwargs:
-            if kwargs['match_similar_keywords'] is not None:
-                if self.valid_match_sim_kw(kwargs['match_similar_keywords']):
-                    self.match_similar_keywords = self.get_boolean(
-                        kwargs['match_similar_keywords'])
-                else:
-                    raise ValidationError(
-                        'Match similar keywords value of \'{}\' '
-                        'could not be validated'.format(self.title))
-
-        if 'state' in kwargs:
-            if self.validate_state(kwargs['state']):
-                self.state = kwargs['state']
-            else:
-                raise ValidationError(
-                    'State of \'{}\' could not be validated'.format(
-                        self.title))
-
-        if 'description' in kwargs:
-            if kwargs['description'] is not None:
-                if self.validate_description(kwargs['description']):
-                    self.description = kwargs['description']
-                else:
-                    self.description = '{}...'.format(
-                        kwargs['description'][:297])
-                    print('Description has been shortened to \'{}\''.format(
-                        self.description))
-
-        if 'reserved_keywords' in kwargs:
-            self.reserved_keywords = self.remove_duplicates(
-                self.get_serialized_values(kwargs['reserved_keywords']))
-
-        if 'categories' in kwargs:
-            self.categories = self.remove_duplicates(
-                self.get_serialized_values(kwargs['categories']))
-
-        if 'start_date' in kwargs:
-            if self.validate_date(kwargs['start_date']):
-                self.start_date = kwargs['start_date']
-            else:
-                raise ValidationError(
-                    'Start Date of \'{}\' could not be validated'.format(
-                        self.title))
+        if not cls.validate_state_and_dates(state, start_date):
+            return ValidationError(
+                'State/End Date of \'{}\' could '
+                'not be validated'.format(title))
 
-        if 'end_date' in kwargs:
-            if self.validate_date(kwargs['end_date']):
-                self.end_date = kwargs['end_date']
-            else:
-                raise ValidationError(
-                    'End Date of \'{}\' could not be validated'.format(
-                        self.title))
-
-        if 'country_region' in kwargs:
-            if self.validate_country_region(
-                    self.get_serialized_values(kwargs['country_region'])):
-                self.country_region = self.get_serialized_values(
-                    kwargs['country_region'])
-            else:
-                raise ValidationError(
-                    'Country/Region of \'{}\' could not be validated'.format(
-                        self.title))
-
-        if 'use_aad_location' in kwargs:
-            if kwargs['use_aad_location'] is not None:
-                if self.validate_use_aad_location(kwargs['use_aad_location']):
-                    self.use_aad_location = self.get_boolean(
-                        kwargs['use_aad_location'])
-                else:
-                    raise ValidationError(
-                        'Use AAD Location of \'{}\' '
-                        'could not be validated'.format(self.title))
-
-        if 'groups' in kwargs:
-            if self.validate_groups(self.get_serialized_values(
-                    kwargs['groups'])):
-                self.groups = self.get_serialized_values(kwargs['groups'])
-            else:
-                raise ValidationError(
-                    'Groups of \'{}\' could not be validated'.format(
-                        self.title))
-
-        if 'device_and_os' in kwargs:
-            if self.validate_device_and_os(self.get_serialized_values(
-                    kwargs['device_and_os'])):
-                self.device_and_os = self.get_serialized_values(
-                    kwargs['device_and_os'])
-            else:
-                raise ValidationError(
-                    'Device/OS of \'{}\' could not be validated'.format(
-                        self.title))
-
-        if 'targeted_variations' in kwargs:
-            if self.validate_targeted_variations(
-                    kwargs['targeted_variations']):
-                self.targeted_variations = self.get_serialized_variations(
-                    kwargs['targeted_variations'])
-            else:
-                raise ValidationError(
-                    'Variations of \'{}\' could not be validated'.format(
-                        self.title))
+        if not cls.validate_keywords_and_reserved_keywords(
+                keywords, reserved_keywords):
+            return ValidationError(
+                'Keywords/Reserved Keywords of \'{}\' could '
+                'not be validated'.format(title))
+        return None
 
-        if 'last_modified' in kwargs:
-            if self.validate_date(kwargs['last_modified']):
-                self.last_modified = kwargs['last_modified']
-            else:
-                raise ValidationError(
-                    'Last Modified Date of \'{}\' could '
-                    'not be validated'.format(self.title))
+    @classmethod
+    def from_row(cls, row, context=None):
+        fields = cls.get_fields()
+        values = tuple(row)
+        if len(values) < len(fields):
+            values = values + (None,) * (len(fields) - len(values))
+        return cls(context=context, **dict(zip(fields, values)))
+
+    @classmethod
+    def validate_rows(cls, rows, context=None):
+        return cls.validate_columns(cls.get_row_columns(rows), context)
+
+    @classmethod
+    def get_row_columns(cls, rows):
+        fields = cls.get_fields()
+        rows = list(rows)
+        columns = list(itertools.zip_longest(*rows))[:len(fields)]
+        columns += [(None,) * len(rows)] * (len(fields) - len(columns))
+        return dict(zip(fields, columns))
+
+    @classmethod
+    def validate_columns(cls, columns: dict, context=None):
+        # Every distinct value of a column is parsed once; the rows then
+        # only look up the outcome of their values. The errors are the
+        # same the constructor would raise for each row.
+        if context is None:
+            context = ValidationContext()
+        outcomes, failures = cls.parse_columns(columns, context)
+        mask = []
+        errors = []
+        for row, error in enumerate(cls.iter_row_errors(
+                outcomes, failures, context.now)):
+            mask.append(error is None)
+            if error is not None:
+                errors.append((row, error))
+        return mask, errors
+
+    @classmethod
+    def from_rows(cls, rows, context=None):
+        # Builds the bookmarks of a chunk of rows like from_row, but with
+        # the outcomes of validate_columns. Returns (bookmark, notices,
+        # error) for each row; the bookmark is None if the row failed.
+        if context is None:
+            context = ValidationContext()
+        columns = cls.get_row_columns(rows)
+        outcomes, failures = cls.parse_columns(columns, context)
+        specs = sorted(cls.get_schema(), key=operator.attrgetter('index'))
+        retval = []
+        for row, error in enumerate(cls.iter_row_errors(
+                outcomes, failures, context.now)):
+            # Like the constructor, only the notices of the columns left of
+            # the failing one are reported
+            last = failures[row].index if row in failures else len(specs)
+            notices = [
+                spec.notice.format(outcomes[spec.name][row][1])
+                for spec in specs[:last] if spec.notice is not None and
+                outcomes[spec.name][row][1] is not columns[spec.name][row]]
+            my_bookmark = None
+            if error is None:
+                my_bookmark = cls.__new__(cls)
+                for spec in specs:
+                    setattr(my_bookmark, spec.name,
+                            cls.copy_parsed(outcomes[spec.name][row][1]))
+            retval.append((my_bookmark, notices, error))
+        return retval
 
-        if 'last_modified_by' in kwargs:
-            self.last_modified_by = kwargs['last_modified_by']
+    @classmethod
+    def copy_parsed(cls, value):
+        # Rows with equal cells share one outcome, but each bookmark gets
+        # lists of its own to modify
+        if type(value) is list:
+            return list(value)
+        if isinstance(value, (list, dict)):
+            return copy.deepcopy(value)
+        return value
+
+    @classmethod
+    def parse_columns(cls, columns: dict, context):
+        sizes = set(len(values) for values in columns.values())
+        if len(sizes) > 1:
+            raise ValueError(
+                'Columns of different lengths {}'.format(sorted(sizes)))
+        outcomes = {}
+        failures = {}
+        for spec in sorted(cls.get_schema(), key=operator.attrgetter('index'),
+                           reverse=True):
+            if spec.name not in columns:
+                continue
+            outcomes[spec.name], failed = cls.parse_column(
+                spec, columns[spec.name], context)
+            # Columns are visited right to left, so the left-most failing
+            # column of a row is the one that remains
+            for row in failed:
+                failures[row] = spec
+        return outcomes, failures
 
-        if 'id' in kwargs:
-            if self.validate_id(kwargs['id']):
-                self.id = kwargs['id']
+    @classmethod
+    def iter_row_errors(cls, outcomes: dict, failures: dict, now=None):
+        size = max((len(values) for values in outcomes.values()), default=0)
+
+        def get_values(name, default):
+            if name not in outcomes:
+                return itertools.repeat(default, size)
+            return (result if ok else default
+                    for ok, result in outcomes[name])
+
+        for row, values in enumerate(zip(
+                get_values('title', ''), get_values('state', None),
+                get_values('start_date', None), get_values('end_date', None),
+                get_values('keywords', []),
+                get_values('reserved_keywords', None))):
+            if row in failures:
+                spec = failures[row]
+                error = outcomes[spec.name][row][1]
+                if isinstance(error, InvalidFieldError):
+                    error = ValidationError(spec.message.format(values[0]))
+                yield error
             else:
-                raise ValidationError(
-                    'ID of \'{}\' could not be validated'.format(self.title))
+                yield cls.check_cross_fields(*values, now=now)
 
-        if not self.validate_start_end_dates(self.start_date, self.end_date):
-            raise ValidationError(
-                'Start Date/End Date of \'{}\' could not be validated'.format(
-                    self.title))
+    @classmethod
+    def parse_column(cls, spec: 'FieldSpec', values: list, context):
+        seen = {}
+        outcomes = []
+        append = outcomes.append
+        has_failures = False
+        for value in values:
+            # The type is part of the key since 1, 1.0 and True are equal
+            # but not parsed alike
+            try:
+                append(seen[type(value), value])
+                continue
+            except KeyError:
+                key = (type(value), value)
+            except TypeError:
+                key = None
+            try:
+                outcome = (True, spec.parse(value, context))
+            except Exception as e:
+                outcome = (False, e)
+                has_failures = True
+            if key is not None:
+                seen[key] = outcome
+            append(outcome)
+        failed = []
+        if has_failures:
+            failed = [row for row, (ok, _) in enumerate(outcomes) if not ok]
+        return outcomes, failed
 
-        if not self.validate_state_and_dates(self.state, self.start_date):
-            raise ValidationError(
-                'State/End Date of \'{}\' could '
-                'not be validated'.format(self.title))
+    @classmethod
+    def get_schema(cls):
+        if cls._schema is None:
+            cls._schema = cls.compile_schema()
+        return cls._schema
 
-        if not self.validate_keywords_and_reserved_keywords(
-                self.keywords, self.reserved_keywords):
-            raise ValidationError(
-                'Keywords/Reserved Keywords of \'{}\' could '
-                'not be validated'.format(self.title))
+    @classmethod
+    def compile_schema(cls):
+        columns = list(cls.get_columns().keys())
+        specs = [
+            FieldSpec('title', 0, cls.parse_title,
+                      notice='Title has been shortened to \'{}\''),
+            FieldSpec('url', 8, cls.parse_url,
+                      'URL of \'{}\' could not be validated'),
+            FieldSpec('keywords', 2, cls.parse_keywords,
+                      'Keywords of \'{}\' could not be validated'),
+            FieldSpec('match_similar_keywords', 1, cls.parse_match_sim_kw,
+                      'Match similar keywords value of \'{}\' '
+                      'could not be validated'),
+            FieldSpec('state', 1, cls.parse_state,
+                      'State of \'{}\' could not be validated'),
+            FieldSpec('description', 1, cls.parse_description,
+                      notice='Description has been shortened to \'{}\''),
+            FieldSpec('reserved_keywords', 2, cls.parse_values),
+            FieldSpec('categories', 2, cls.parse_categories),
+            FieldSpec('start_date', 1, cls.parse_date,
+                      'Start Date of \'{}\' could not be validated'),
+            FieldSpec('end_date', 1, cls.parse_date,
+                      'End Date of \'{}\' could not be validated'),
+            FieldSpec('country_region', 3, cls.parse_country_region,
+                      'Country/Region of \'{}\' could not be validated'),
+            FieldSpec('use_aad_location', 1, cls.parse_use_aad_location,
+                      'Use AAD Location of \'{}\' could not be validated'),
+            FieldSpec('groups', 6, cls.parse_groups,
+                      'Groups of \'{}\' could not be validated'),
+            FieldSpec('device_and_os', 3, cls.parse_device_and_os,
+                      'Device/OS of \'{}\' could not be validated'),
+            FieldSpec('targeted_variations', 10, cls.parse_variations,
+                      'Variations of \'{}\' could not be validated'),
+            FieldSpec('last_modified', 1, cls.parse_date,
+                      'Last Modified Date of \'{}\' could '
+                      'not be validated'),
+            FieldSpec('last_modified_by', 0, cls.parse_any),
+            FieldSpec('id', 5, cls.parse_id,
+                      'ID of \'{}\' could not be validated')
+        ]
+        for index, spec in enumerate(specs):
+            spec.index = index
+            spec.column = columns[index]
+        return tuple(sorted(specs, key=lambda s: (s.cost, s.index)))
+
+    @classmethod
+    def parse_title(cls, value, context):
+        if cls.validate_title(value):
+            return value
+        return '{}...'.format(value[:57])
+
+    @classmethod
+    def parse_url(cls, value, context):
+        if cls.validate_url(value):
+            return value
+        raise InvalidFieldError()
+
+    @classmethod
+    def parse_keywords(cls, value, context):
+        keywords = cls.remove_duplicates(cls.get_serialized_values(value))
+        if cls.validate_keywords(keywords):
+            return keywords
+        raise InvalidFieldError()
+
+    @classmethod
+    def parse_match_sim_kw(cls, value, context):
+        if value is None:
+            return True
+        if cls.valid_match_sim_kw(value):
+            return cls.get_boolean(value)
+        raise InvalidFieldError()
+
+    @classmethod
+    def parse_state(cls, value, context):
+        if cls.validate_state(value):
+            return context.intern(value)
+        raise InvalidFieldError()
+
+    @classmethod
+    def parse_description(cls, value, context):
+        if value is None or cls.validate_description(value):
+            return value
+        return '{}...'.format(value[:297])
+
+    @classmethod
+    def parse_values(cls, value, context):
+        return cls.remove_duplicates(cls.get_serialized_values(value))
+
+    @classmethod
+    def parse_categories(cls, value, context):
+        return context.share_values(
+            'categories', value, cls.parse_values(value, context))
+
+    @classmethod
+    def parse_date(cls, value, context):
+        if cls.validate_date(value):
+            return value
+        raise InvalidFieldError()
+
+    @classmethod
+    def parse_country_region(cls, value, context):
+        values = cls.get_serialized_values(value)
+        if context.check('country_region', value, values,
+                         cls.validate_country_region):
+            return context.share_values('country_region', value, values)
+        raise InvalidFieldError()
+
+    @classmethod
+    def parse_use_aad_location(cls, value, context):
+        if value is None:
+            return False
+        if cls.validate_use_aad_location(value):
+            return cls.get_boolean(value)
+        raise InvalidFieldError()
+
+    @classmethod
+    def parse_groups(cls, value, context):
+        values = cls.get_serialized_values(value)
+        if context.check('groups', value, values, cls.validate_groups):
+            return context.share_values('groups', value, values)
+        raise InvalidFieldError()
+
+    @classmethod
+    def parse_device_and_os(cls, value, context):
+        values = cls.get_serialized_values(value)
+        if context.check('device_and_os', value, values,
+                         cls.validate_device_and_os):
+            return context.share_values('device_and_os', value, values)
+        raise InvalidFieldError()
+
+    @classmethod
+    def parse_variations(cls, value, context):
+        if value is None:
+            return None
+        variations = cls.load_variations(value)
+        if context.check('targeted_variations', value, variations,
+                         cls.validate_variations):
+            if isinstance(variations, list):
+                return TargetedVariations(variations, value)
+            return variations
+        raise InvalidFieldError()
+
+    @classmethod
+    def parse_any(cls, value, context):
+        return value
+
+    @classmethod
+    def parse_id(cls, value, context):
+        if cls.validate_id(value):
+            return value
+        raise InvalidFieldError()
 
     def to_string(self):
-        if self.match_similar_keywords:
-            match_similar_keywords = 'true'
-        else:
-            match_similar_keywords = ''
-        if self.description is None:
-            description = ''
-        else:
-            description = self.description
-        if self.reserved_keywords is None:
-            reserved_keywords = ''
-        else:
-            reserved_keywords = ';'.join(self.reserved_keywords)
-        if self.categories is None:
-            categories = ''
-        else:
-            categories = ';'.join(self.categories)
-        if self.start_date is None:
-            start_date = ''
-        else:
-            start_date = self.start_date.strftime('%Y-%m-%dT%H:%M:%S+00')
-        if self.end_date is None:
-            end_date = ''
-        else:
-            end_date = self.end_date.strftime('%Y-%m-%dT%H:%M:%S+00')
-        if self.country_region is None:
-            country_region = ''
-        else:
-            country_region = ';'.join(self.country_region)
-        if self.use_aad_location:
-            use_aad_location = 'True'
-        else:
-            use_aad_location = 'False'
-        if self.groups is None:
-            groups = ''
-        else:
-            groups = ';'.join(self.groups)
-        if self.device_and_os is None:
-            device_and_os = ''
-        else:
-            device_and_os = ';'.join(self.device_and_os)
-        if self.targeted_variations is None:
-            targeted_variations = ''
-        else:
-            targeted_variations = self.targeted_variations
-        if self.last_modified is None:
-            last_modified = ''
-        else:
-            last_modified = self.last_modified.strftime('%m/%d/%Y')
-        if self.last_modified_by is None:
-            last_modified_by = ''
-        else:
-            last_modified_by = self.last_modified_by
-        if self.id is None:
-            id = ''
-        else:
-            id = self.id
-        retval = [
-            self.title,
-            self.url,
-            ';'.join(self.keywords),
-            match_similar_keywords,
-            self.state,
-            description,
-            reserved_keywords,
-            categories,
-            start_date,
-            end_date,
-            country_region,
-            use_aad_location,
-            groups,
-            device_and_os,
-            targeted_variations,
-            last_modified,
-            last_modified_by,
-            id
-        ]
-        return retval
+        getter, formatters = self.get_serializer()
+        return [
+            formatter(value)
+            for formatter, value in zip(formatters, getter(self))]
+
+    @classmethod
+    def get_serializer(cls):
+        if cls._serializer is None:
+            cls._serializer = cls.compile_serializer()
+        return cls._serializer
+
+    @classmethod
+    def compile_serializer(cls):
+        def same(value):
+            return value
+
+        def text(value):
+            return '' if value is None else value
+
+        def joined(value):
+            return '' if value is None else ';'.join(value)
+
+        def timestamp(value):
+            return '' if value is None else date_codec.format_timestamp(value)
+
+        def day(value):
+            return '' if value is None else date_codec.format_date(value)
+
+        formatters = {
+            'keywords': ';'.join,
+            'match_similar_keywords': lambda v: 'true' if v else '',
+            'description': text,
+            'reserved_keywords': joined,
+            'categories': joined,
+            'start_date': timestamp,
+            'end_date': timestamp,
+            'country_region': joined,
+            'use_aad_location': lambda v: 'True' if v else 'False',
+            'groups': joined,
+            'device_and_os': joined,
+            'targeted_variations': lambda v: '' if v is None else getattr(
+                v, 'raw', v),
+            'last_modified': day,
+            'last_modified_by': text,
+            'id': text
+        }
+        fields = cls.get_fields()
+        return (operator.attrgetter(*fields),
+                tuple(formatters.get(field, same) for field in fields))
 
     @classmethod
     def get_serialized_values(cls, strvalues):
@@ -326,10 +538,8 @@ class Bookmark(object):
     def remove_duplicates(cls, keywords):
         unique_keywords = None
         if keywords is not None:
-            unique_keywords = []
-            for kw in keywords:
-                if not kw.lower() in unique_keywords:
-                    unique_keywords.append(kw.lower())
+            unique_keywords = list(dict.fromkeys(
+                kw.lower() for kw in keywords))
         return unique_keywords
 
     @classmethod
@@ -340,21 +550,32 @@ class Bookmark(object):
 
     @classmethod
     def validate_url(cls, url):
+        # Main and variation URLs share one memo cache; anything that is
+        # not a string is checked directly to keep its original error
+        if isinstance(url, str):
+            return validate_url_string(url)
+        return cls.check_url(url)
+
+    @classmethod
+    def check_url(cls, url):
         myurl = urllib.parse.quote(url, safe=':/%')
         if url is not None and (
-                validators.url(myurl) or cls.validate_alias_url(myurl)):
+                validation.validate_url(myurl) or
+                cls.validate_alias_url(myurl)):
             return True
         return False
 
+    @classmethod
+    def get_url_cache_info(cls):
+        return validate_url_string.cache_info()
+
+    @classmethod
+    def clear_url_cache(cls):
+        validate_url_string.cache_clear()
+
     @classmethod
     def validate_alias_url(cls, url):
-        u = urllib.parse.urlparse(url)
-        alias = '{}://{}'.format(u.scheme, u.hostname)
-        alias_pattern = re.compile(r'^http[s]?:\/\/[\w|-]{3,}\/?$', re.I)
-        if alias_pattern.match(alias):
-            return True
-        else:
-            return False
+        return validation.validate_alias_url(url)
 
     @classmethod
     def validate_keywords(cls, keywords: list):
@@ -376,7 +597,7 @@ class Bookmark(object):
 
     @classmethod
     def validate_state(cls, state: str):
-        if state in enums.Enums().status:
+        if state in enums.STATUS_CODES:
             return True
         return False
 
@@ -395,8 +616,9 @@ class Bookmark(object):
     @classmethod
     def validate_country_region(cls, country_region):
         if country_region is not None:
+            country_codes = enums.get_country_codes()
             for region in country_region:
-                if region not in enums.Enums().countries:
+                if region not in country_codes:
                     return False
         return True
 
@@ -409,69 +631,84 @@ class Bookmark(object):
     @classmethod
     def validate_groups(cls, groups):
         if groups is not None:
-            for group in groups:
-                if not validators.uuid(group):
-                    return False
+            if not all(validation.validate_uuids(groups)):
+                return False
         return True
 
     @classmethod
     def validate_device_and_os(cls, device_and_os):
         if device_and_os is not None:
             for spec in device_and_os:
-                if spec not in enums.Enums().devices:
+                if spec not in enums.DEVICE_CODES:
                     return False
         return True
 
+    @classmethod
+    def load_variations(cls, tv):
+        if orjson is not None:
+            try:
+                return orjson.loads(tv)
+            except orjson.JSONDecodeError:
+                # json raises the errors users know, and accepts the few
+                # inputs like NaN or huge integers that orjson refuses
+                pass
+        return json.loads(tv)
+
     @classmethod
     def validate_targeted_variations(cls, tv):
         if tv is not None:
-            _tv_json = json.loads(tv)
-            for i in range(len(_tv_json)):
-                for key in list(_tv_json[i].keys()):
-                    if key not in enums.Enums().variations:
-                        return False
-                    if key == 'title':
-                        if not cls.validate_title(_tv_json[i][key]):
-                            raise ValidationError(
-                                'Variation Title \'{}\' could not be '
-                                'validated'.format(_tv_json[i][key]))
-                    if key == 'url':
-                        if not cls.validate_url(_tv_json[i][key]):
-                            raise ValidationError(
-                                'Variation URL \'{}\' could not be '
-                                'validated'.format(_tv_json[i][key]))
-                    if key == 'description':
-                        if not cls.validate_description(_tv_json[i][key]):
-                            raise ValidationError(
-                                'Variation Description \'{}\' could not be '
-                                'validated'.format(_tv_json[i][key]))
-                    if key == 'country':
-                        if not cls.validate_country_region(
-                                cls.get_serialized_values(_tv_json[i][key])):
-                            raise ValidationError(
-                                'Variation Country \'{}\' could not be '
-                                'validated'.format(_tv_json[i][key]))
-                    if key == 'device':
-                        if not cls.validate_device_and_os(
-                                cls.get_serialized_values(_tv_json[i][key])):
-                            raise ValidationError(
-                                'Variation Device \'{}\' could not be '
-                                'validated'.format(_tv_json[i][key]))
-            return True
+            return cls.validate_variations(cls.load_variations(tv))
         else:
             return True
 
+    @classmethod
+    def validate_variations(cls, variations):
+        for i in range(len(variations)):
+            for key in list(variations[i].keys()):
+                if key not in enums.VARIATION_KEYS:
+                    return False
+                if key == 'title':
+                    if not cls.validate_title(variations[i][key]):
+                        raise ValidationError(
+                            'Variation Title \'{}\' could not be '
+                            'validated'.format(variations[i][key]))
+                if key == 'url':
+                    if not cls.validate_url(variations[i][key]):
+                        raise ValidationError(
+                            'Variation URL \'{}\' could not be '
+                            'validated'.format(variations[i][key]))
+                if key == 'description':
+                    if not cls.validate_description(variations[i][key]):
+                        raise ValidationError(
+                            'Variation Description \'{}\' could not be '
+                            'validated'.format(variations[i][key]))
+                if key == 'country':
+                    if not cls.validate_country_region(
+                            cls.get_serialized_values(variations[i][key])):
+                        raise ValidationError(
+                            'Variation Country \'{}\' could not be '
+                            'validated'.format(variations[i][key]))
+                if key == 'device':
+                    if not cls.validate_device_and_os(
+                            cls.get_serialized_values(variations[i][key])):
+                        raise ValidationError(
+                            'Variation Device \'{}\' could not be '
+                            'validated'.format(variations[i][key]))
+        return True
+
     @classmethod
     def validate_id(cls, id):
         if id is not None:
-            if not validators.uuid(id):
+            if not validation.validate_uuid(id):
                 return False
         return True
 
     @classmethod
-    def validate_start_end_dates(cls, sdate, edate):
+    def validate_start_end_dates(cls, sdate, edate, now=None):
+        if now is None:
+            now = datetime.datetime.now()
         if isinstance(edate, datetime.date):
-            if edate.timestamp() < datetime.datetime.now().timestamp():
+            if edate.timestamp() < now.timestamp():
                 return False
         if isinstance(sdate, datetime.date) and isinstance(
                 edate, datetime.date):
@@ -496,6 +733,29 @@ class Bookmark(object):
                     return False
         return True
 
+    @classmethod
+    def get_fields(cls):
+        return (
+            'title',
+            'url',
+            'keywords',
+            'match_similar_keywords',
+            'state',
+            'description',
+            'reserved_keywords',
+            'categories',
+            'start_date',
+            'end_date',
+            'country_region',
+            'use_aad_location',
+            'groups',
+            'device_and_os',
+            'targeted_variations',
+            'last_modified',
+            'last_modified_by',
+            'id'
+        )
+
     @classmethod
     def get_columns(cls):
         return {
@@ -520,5 +780,226 @@ class Bookmark(object):
         }
 
 
+@functools.lru_cache(maxsize=URL_CACHE_SIZE)
+def validate_url_string(url: str):
+    return Bookmark.check_url(url)
+
+
+class FieldSpec(object):
+
+    def __init__(self, name: str, cost: int, parse, message=None,
+                 notice=None):
+        self.name = name
+        self.cost = cost
+        self.parse = parse
+        self.message = message
+        self.notice = notice
+        self.index = None
+        self.column = None
+
+
+class ValidationContext(object):
+
+    def __init__(self, now=None, notices: list = None,
+                 cache_size: int = None):
+        if now is None:
+            now = datetime.datetime.now()
+        self.now = now
+        # Notices are printed right away unless a list collects them
+        self.notices = notices
+        # Without a cache size the caches live as long as the context; with
+        # one, each cache drops its least recently used entries
+        self.cache_size = cache_size
+        self.caches = {}
+        self.values = self.new_cache()
+        self.shared = {}
+
+    def new_cache(self):
+        if self.cache_size is None:
+            return {}
+        return collections.OrderedDict()
+
+    def get_cached(self, cache: dict, key):
+        value = cache[key]
+        if self.cache_size is not None:
+            cache.move_to_end(key)
+        return value
+
+    def set_cached(self, cache: dict, key, value):
+        cache[key] = value
+        if self.cache_size is not None and len(cache) > self.cache_size:
+            cache.popitem(last=False)
+
+    def notify(self, notice: str):
+        if self.notices is None:
+            print(notice)
+        else:
+            self.notices.append(notice)
+
+    def check(self, name: str, key, value, validate):
+        # Unhashable keys bypass the cache; exceptions are never cached so
+        # they surface again for every row carrying the same value.
+        if name not in self.caches:
+            self.caches[name] = self.new_cache()
+        cache = self.caches[name]
+        try:
+            return self.get_cached(cache, key)
+        except KeyError:
+            result = validate(value)
+            self.set_cached(cache, key, result)
+            return result
+        except TypeError:
+            return validate(value)
+
+    def intern(self, value):
+        # Per-run value dictionary: equal strings read from different rows
+        # share one object and are released together with the context
+        if value is None:
+            return None
+        try:
+            return self.get_cached(self.values, value)
+        except KeyError:
+            self.set_cached(self.values, value, value)
+            return value
+
+    def share_values(self, name: str, key, values: list):
+        # Rows carrying the same raw cell share the interned strings of one
+        # tuple; each bookmark still gets a list of its own to modify
+        if values is None:
+            return None
+        if name not in self.shared:
+            self.shared[name] = self.new_cache()
+        shared = self.shared[name]
+        try:
+            return list(self.get_cached(shared, key))
+        except KeyError:
+            items = tuple(self.intern(v) for v in values)
+            self.set_cached(shared, key, items)
+            return list(items)
+        except TypeError:
+            return values
+
+
+class BookmarkRecord(object):
+
+    # Compact read-only form of a validated bookmark for large shelves:
+    # multi-valued fields become tuples and their values are interned,
+    # so repeated keywords, countries or groups share one string.
+    __slots__ = Bookmark.__slots__
+
+    def __init__(self, *values):
+        for name, value in zip(self.__slots__, values):
+            setattr(self, name, value)
+
+    @classmethod
+    def from_bookmark(cls, bm: Bookmark):
+        # A lazy bookmark has not run the checks across fields yet
+        if isinstance(bm, LazyBookmark):
+            bm = bm.validate_all()
+        values = []
+        for name in cls.__slots__:
+            value = getattr(bm, name)
+            if type(value) is list:
+                value = tuple(
+                    sys.intern(v) if type(v) is str else v for v in value)
+            elif name in ('state', 'last_modified_by') and \
+                    type(value) is str:
+                value = sys.intern(value)
+            values.append(value)
+        return cls(*values)
+
+    def to_string(self):
+        getter, formatters = Bookmark.get_serializer()
+        return [
+            formatter(value)
+            for formatter, value in zip(formatters, getter(self))]
+
+
+class LazyBookmark(object):
+
+    # Keeps the raw row and parses each field on first access, so
+    # read-mostly work on large shelves skips the URL, GUID and JSON checks
+    # of the fields it never reads. validate_all() runs every check of
+    # Bookmark and is done before a lazy bookmark is exported.
+    __slots__ = Bookmark.__slots__ + ('row', 'context')
+
+    _specs = None
+
+    def __init__(self, row, context=None):
+        fields = Bookmark.get_fields()
+        values = tuple(row)[:len(fields)]
+        if len(values) < len(fields):
+            values = values + (None,) * (len(fields) - len(values))
+        if context is None:
+            context = ValidationContext()
+        self.row = values
+        self.context = context
+
+    @classmethod
+    def from_row(cls, row, context=None):
+        return cls(row, context)
+
+    @classmethod
+    def get_specs(cls):
+        if cls._specs is None:
+            cls._specs = {spec.name: spec for spec in Bookmark.get_schema()}
+        return cls._specs
+
+    def __getattr__(self, name: str):
+        # Only reached for fields that have not been parsed yet
+        try:
+            spec = self.get_specs()[name]
+        except KeyError:
+            raise AttributeError(
+                '\'{}\' object has no attribute \'{}\''.format(
+                    type(self).__name__, name)) from None
+        value = self.row[spec.index]
+        try:
+            parsed = spec.parse(value, self.context)
+        except InvalidFieldError:
+            raise ValidationError(spec.message.format(self.title)) from None
+        if spec.notice is not None and parsed is not value:
+            self.context.notify(spec.notice.format(parsed))
+        setattr(self, name, parsed)
+        return parsed
+
+    def is_validated(self):
+        return self.row is None
+
+    def validate_all(self):
+        # Fields are parsed from A to R, so the error raised is the one of
+        # the left-most failing column, like in Bookmark
+        if self.row is None:
+            return self
+        for name in Bookmark.get_fields():
+            getattr(self, name)
+        error = Bookmark.check_cross_fields(
+            self.title, self.state, self.start_date, self.end_date,
+            self.keywords, self.reserved_keywords, self.context.now)
+        if error is not None:
+            raise error
+        self.row = None
+        return self
+
+    def to_string(self):
+        self.validate_all()
+        getter, formatters = Bookmark.get_serializer()
+        return [
+            formatter(value)
+            for formatter, value in zip(formatters, getter(self))]
+
+
+class TargetedVariations(list):
+
+    def __init__(self, variations: list, raw: str):
+        super().__init__(variations)
+        # The validated source string is written back unchanged
+        self.raw = raw
+
+
+class InvalidFieldError(Exception):
+    pass
+
+
 class ValidationError(Exception):
     pass
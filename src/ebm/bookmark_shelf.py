@@ -35,47 +35,80 @@ except ModuleNotFoundError:
 
 class BookmarkShelf(object):
 
-    def __init__(self):
+    def __init__(self, keep_bookmarks: bool = True, compact: bool = False):
         self.shelf = {}
-        self.keywords = []
-        self.reserved_keywords = []
+        self.keyword_index = {}
+        self.reserved_keyword_index = {}
+        self.titles = set()
+        self.keep_bookmarks = keep_bookmarks
+        self.compact = compact
+
+    @property
+    def keywords(self):
+        return list(self.keyword_index)
+
+    @keywords.setter
+    def keywords(self, keywords: list):
+        self.keyword_index = {}
+        self.add_keywords(keywords)
+
+    @property
+    def reserved_keywords(self):
+        return list(self.reserved_keyword_index)
+
+    @reserved_keywords.setter
+    def reserved_keywords(self, rkeywords: list):
+        self.reserved_keyword_index = {}
+        self.add_reserved_keywords(rkeywords)
 
     def add_bookmark(self, bm: bookmark.Bookmark):
+        # Without kept bookmarks the indexes only record the keywords
+        key = str(uuid.uuid4()) if self.keep_bookmarks else None
         if self.validate_keywords(bm.keywords):
-            self.keywords = self.keywords + bm.keywords
+            self.add_keywords(bm.keywords, key)
         if self.validate_reserved_keywords(bm.reserved_keywords):
-            self.add_reserved_keywords(bm.reserved_keywords)
+            self.add_reserved_keywords(bm.reserved_keywords, key)
         if self.validate_title_with_state(bm.title, bm.state):
-            self.shelf[str(uuid.uuid4())] = bm
+            if bm.state in ['published', 'scheduled']:
+                self.titles.add((bm.title, bm.state))
+            if self.keep_bookmarks:
+                if self.compact:
+                    bm = bookmark.BookmarkRecord.from_bookmark(bm)
+                self.shelf[key] = bm
         else:
             raise ValidationError(
                 'A bookmark with the title \'{}\' exists already'.format(
                     bm.title))
 
-    def add_reserved_keywords(self, rkeywords: list):
+    def add_keywords(self, keywords: list, key: str = None):
+        if not self.keep_bookmarks:
+            for kw in keywords:
+                self.keyword_index.setdefault(kw, None)
+            return
+        for kw in keywords:
+            keys = self.keyword_index.setdefault(kw, [])
+            if key is not None:
+                keys.append(key)
+
+    def add_reserved_keywords(self, rkeywords: list, key: str = None):
         if rkeywords is not None:
             for kw in rkeywords:
-                if kw in self.reserved_keywords:
+                if kw in self.reserved_keyword_index:
                     raise ValidationError(
                         'The reserved keyword \'{}\' exists already'.format(
                             kw))
-            self.reserved_keywords = self.reserved_keywords + rkeywords
+            for kw in rkeywords:
+                self.reserved_keyword_index[kw] = key
 
     def validate_title_with_state(self, title: str, state: str):
-        bms = self.get_bookmarks()
-        for id in bms:
-            bm = bms[id]
-            mytitle = bm.title
-            mystate = bm.state
-            if (title == mytitle and
-                    state in ['published', 'scheduled'] and state == mystate):
-                return False
+        if state in ['published', 'scheduled']:
+            return (title, state) not in self.titles
         return True
 
     def validate_reserved_keywords(self, rkeywords: list):
         if rkeywords is not None:
             for kw in rkeywords:
-                if kw in self.keywords:
+                if kw in self.keyword_index:
                     raise ValidationError(
                         'The reserved keyword \'{}\' exists in '
                         'other keywords'.format(kw))
@@ -84,7 +117,7 @@ class BookmarkShelf(object):
     def validate_keywords(self, keywords: list):
         if keywords is not None:
             for kw in keywords:
-                if kw in self.reserved_keywords:
+                if kw in self.reserved_keyword_index:
                     raise ValidationError(
                         'The keyword \'{}\' exists as reserved keyword'.format(
                             kw))
@@ -96,6 +129,11 @@ class BookmarkShelf(object):
     def get_bookmarks(self):
         return self.shelf
 
+    def get_bookmarks_by_keyword(self, keyword: str):
+        return [self.shelf[key]
+                for key in self.keyword_index.get(keyword) or []
+                if key in self.shelf]
+
 
 class ValidationError(Exception):
     pass
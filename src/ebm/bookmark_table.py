@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# The MIT License (MIT)
+#
+# Copyright (c) 2025, Roland Rickborn (r_2@gmx.net)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+# ---------------------------------------------------------------------------
+
+import array
+import bisect
+import itertools
+import operator
+
+try:
+    import src.ebm.bm2xls as bm2xls
+    import src.ebm.bookmark as bookmark
+    import src.ebm.bookmark_shelf as bookmark_shelf
+    import src.ebm.utils as utils
+    import src.ebm.xls2bm as xls2bm
+except ModuleNotFoundError:
+    import bm2xls
+    import bookmark
+    import bookmark_shelf
+    import utils
+    import xls2bm
+
+
+def get_bitset(rows, size: int):
+    bitmap = bytearray((size + 7) // 8)
+    for row in rows:
+        bitmap[row >> 3] |= 1 << (row & 7)
+    return int.from_bytes(bitmap, 'little')
+
+
+def iter_bitset(mask: int, size: int):
+    for index, byte in enumerate(mask.to_bytes((size + 7) // 8, 'little')):
+        while byte:
+            low = byte & -byte
+            yield (index << 3) + low.bit_length() - 1
+            byte ^= low
+
+
+class DictionaryColumn(object):
+
+    # Every row stores the code of its value. The rows per code and the
+    # bitsets of queries are built on demand and dropped on the next append.
+    def __init__(self):
+        self.codes = array.array('I')
+        self.values = []
+        self.index = {}
+        self.cache = {}
+        self.cache_size = 0
+
+    def __len__(self):
+        return len(self.codes)
+
+    def append(self, value):
+        self.extend((value,))
+
+    def extend(self, values):
+        index = self.index
+        append = self.codes.append
+        for value in values:
+            code = index.get(value)
+            if code is None:
+                code = index[value] = len(self.values)
+                self.values.append(value)
+            append(code)
+
+    def get_value(self, row: int):
+        return self.values[self.codes[row]]
+
+    def get_cached(self, key, build):
+        if self.cache_size != len(self.codes):
+            self.cache.clear()
+            self.cache_size = len(self.codes)
+        try:
+            return self.cache[key]
+        except KeyError:
+            value = self.cache[key] = build()
+            return value
+
+    def get_postings(self):
+        def build():
+            postings = [array.array('I') for _ in self.values]
+            for row, code in enumerate(self.codes):
+                postings[code].append(row)
+            return postings
+        return self.get_cached('postings', build)
+
+    def get_rows_bitset(self, codes):
+        postings = self.get_postings()
+        return get_bitset(itertools.chain.from_iterable(
+            postings[code] for code in codes), len(self))
+
+    def where(self, *values):
+        codes = [self.index[value] for value in values if value in self.index]
+        return self.get_cached(
+            ('where', values), lambda: self.get_rows_bitset(codes))
+
+    def where_between(self, start=None, end=None):
+        # Dictionaries of dates stay small, so the distinct values are
+        # sorted and only the rows of the matching values are touched
+        values = self.get_cached('sorted', lambda: sorted(
+            (value, code) for code, value in enumerate(self.values)
+            if value is not None))
+        keys = [value for value, _ in values]
+        low = 0 if start is None else bisect.bisect_left(keys, start)
+        high = len(keys) if end is None else bisect.bisect_right(keys, end)
+        return self.get_rows_bitset(code for _, code in values[low:high])
+
+    def format(self, formatter):
+        formatted = [
+            xls2bm.get_output_row([formatter(value)])[0]
+            for value in self.values]
+        return [formatted[code] for code in self.codes]
+
+
+class MultiValueColumn(DictionaryColumn):
+
+    # The lists of a row are stored as tuples; a filter on single values
+    # like one country or device looks up the codes of all tuples holding
+    # them
+    def extend(self, values):
+        super().extend(
+            None if value is None else tuple(value) for value in values)
+
+    def get_item_codes(self):
+        def build():
+            item_codes = {}
+            for code, value in enumerate(self.values):
+                for item in dict.fromkeys(value or ()):
+                    item_codes.setdefault(item, []).append(code)
+            return item_codes
+        return self.get_cached('items', build)
+
+    def where(self, *items):
+        item_codes = self.get_item_codes()
+        codes = sorted(set(itertools.chain.from_iterable(
+            item_codes.get(item, ()) for item in items)))
+        return self.get_cached(
+            ('where', items), lambda: self.get_rows_bitset(codes))
+
+
+class TextColumn(object):
+
+    def __init__(self):
+        self.values = []
+
+    def __len__(self):
+        return len(self.values)
+
+    def append(self, value):
+        self.values.append(value)
+
+    def extend(self, values):
+        self.values.extend(values)
+
+    def get_value(self, row: int):
+        return self.values[row]
+
+    def format(self, formatter):
+        return xls2bm.get_output_row(
+            [formatter(value) for value in self.values])
+
+
+class BookmarkTable(object):
+
+    TEXT_FIELDS = ('title', 'url', 'description', 'targeted_variations', 'id')
+    MULTI_VALUE_FIELDS = ('keywords', 'reserved_keywords', 'categories',
+                          'country_region', 'groups', 'device_and_os')
+
+    def __init__(self):
+        self.columns = {}
+        for field in bookmark.Bookmark.get_fields():
+            if field in self.TEXT_FIELDS:
+                self.columns[field] = TextColumn()
+            elif field in self.MULTI_VALUE_FIELDS:
+                self.columns[field] = MultiValueColumn()
+            else:
+                self.columns[field] = DictionaryColumn()
+
+    def __len__(self):
+        return len(self.columns['title'])
+
+    @classmethod
+    def from_bookmarks(cls, bookmarks):
+        retval = cls()
+        retval.extend(bookmarks)
+        return retval
+
+    @classmethod
+    def from_excel(cls, filename: str):
+        # The shelf only keeps its indexes to check duplicate titles and
+        # keywords like the other readers do
+        shelf = bookmark_shelf.BookmarkShelf(keep_bookmarks=False)
+        return cls.from_bookmarks(xls2bm.iter_bookmarks(filename, shelf))
+
+    def append(self, bm):
+        self.extend((bm,))
+
+    def extend(self, bookmarks):
+        getter = operator.attrgetter(*self.columns)
+        rows = [getter(bm) for bm in bookmarks]
+        for column, values in zip(self.columns.values(), zip(*rows)):
+            column.extend(values)
+
+    def get_all(self):
+        return (1 << len(self)) - 1
+
+    def where_state(self, *states):
+        return self.columns['state'].where(*states)
+
+    def where_country(self, *countries):
+        return self.columns['country_region'].where(*countries)
+
+    def where_device(self, *devices):
+        return self.columns['device_and_os'].where(*devices)
+
+    def where_date(self, field: str, start=None, end=None):
+        return self.columns[field].where_between(start, end)
+
+    def select(self, state=None, country=None, device=None,
+               date_field='start_date', start=None, end=None):
+        mask = self.get_all()
+        if state is not None:
+            mask &= self.where_state(*self.get_values(state))
+        if country is not None:
+            mask &= self.where_country(*self.get_values(country))
+        if device is not None:
+            mask &= self.where_device(*self.get_values(device))
+        if start is not None or end is not None:
+            mask &= self.where_date(date_field, start, end)
+        return mask
+
+    @classmethod
+    def get_values(cls, values):
+        if isinstance(values, str):
+            return (values,)
+        return tuple(values)
+
+    def count(self, mask: int = None, **filters):
+        if mask is None:
+            mask = self.select(**filters)
+        return mask.bit_count()
+
+    def iter_rows(self, mask: int = None):
+        if mask is None:
+            return iter(range(len(self)))
+        return iter_bitset(mask, len(self))
+
+    def get_record(self, row: int):
+        return bookmark.BookmarkRecord(*(
+            column.get_value(row) for column in self.columns.values()))
+
+    def iter_output_rows(self, mask: int = None):
+        _, formatters = bookmark.Bookmark.get_serializer()
+        columns = [
+            column.format(formatter) for column, formatter in zip(
+                self.columns.values(), formatters)]
+        if mask is None:
+            return zip(*columns)
+        return ([column[row] for column in columns]
+                for row in self.iter_rows(mask))
+
+    def write_csv(self, filename: str, mask: int = None, limit: int = 3000):
+        return xls2bm.write_output_files(
+            filename, self.iter_output_rows(mask), limit)
+
+    def write_xlsx(self, filename: str, mask: int = None,
+                   title: str = 'Bookmarks'):
+        new_filename = utils.get_save_filename('{}.xlsx'.format(filename))
+        header = list(bookmark.Bookmark.get_columns().values())
+        bm2xls.write_workbook(new_filename, title, itertools.chain(
+            [header], self.iter_output_rows(mask)))
+        return new_filename
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# The MIT License (MIT)
+#
+# Copyright (c) 2025, Roland Rickborn (r_2@gmx.net)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+# ---------------------------------------------------------------------------
+
+import datetime as dt
+import functools
+import locale
+
+TIMESTAMP_FORMAT = '%Y-%m-%dT%H:%M:%S+00'
+DATE_FORMAT = '%m/%d/%Y'
+
+
+@functools.lru_cache(maxsize=4096)
+def parse(datetimestr: str):
+    # Admin Center writes exactly 'YYYY-MM-DDTHH:MM:SS+00' and 'MM/DD/YYYY';
+    # these are decoded by slicing, anything else goes through strptime.
+    if 'T' in datetimestr and '+' in datetimestr:
+        if (len(datetimestr) == 22 and datetimestr.endswith('+00') and
+                datetimestr[4] + datetimestr[7] + datetimestr[10] +
+                datetimestr[13] + datetimestr[16] == '--T::' and
+                _is_digits(datetimestr[0:4] + datetimestr[5:7] +
+                           datetimestr[8:10] + datetimestr[11:13] +
+                           datetimestr[14:16] + datetimestr[17:19])):
+            try:
+                return dt.datetime(
+                    int(datetimestr[0:4]), int(datetimestr[5:7]),
+                    int(datetimestr[8:10]), int(datetimestr[11:13]),
+                    int(datetimestr[14:16]), int(datetimestr[17:19]))
+            except ValueError:
+                return datetimestr
+        try:
+            d = dt.datetime.strptime(datetimestr+'00', '%Y-%m-%dT%H:%M:%S%z')
+            return d.replace(tzinfo=None)
+        except Exception:
+            return datetimestr
+    if (len(datetimestr) == 10 and
+            datetimestr[2] + datetimestr[5] == '//' and
+            _is_digits(datetimestr[0:2] + datetimestr[3:5] +
+                       datetimestr[6:10])):
+        try:
+            return dt.datetime(
+                int(datetimestr[6:10]), int(datetimestr[0:2]),
+                int(datetimestr[3:5]))
+        except ValueError:
+            return datetimestr
+    try:
+        return dt.datetime.strptime(datetimestr, DATE_FORMAT)
+    except Exception:
+        return datetimestr
+
+
+def _is_digits(value: str):
+    return value.isascii() and value.isdigit()
+
+
+def format_timestamp(value: dt.datetime):
+    # strftime does not pad years below 1000 on every platform
+    if value.year < 1000:
+        return value.strftime(TIMESTAMP_FORMAT)
+    return _format_timestamp(value, value.utcoffset())
+
+
+def format_date(value: dt.datetime):
+    if value.year < 1000:
+        return value.strftime(DATE_FORMAT)
+    return _format_date(value, value.utcoffset())
+
+
+@functools.lru_cache(maxsize=4096)
+def _format_timestamp(value: dt.datetime, utcoffset: dt.timedelta):
+    # Aware datetimes in different zones compare equal, so the offset is
+    # part of the cache key
+    return '%04d-%02d-%02dT%02d:%02d:%02d+00' % (
+        value.year, value.month, value.day,
+        value.hour, value.minute, value.second)
+
+
+@functools.lru_cache(maxsize=4096)
+def _format_date(value: dt.datetime, utcoffset: dt.timedelta):
+    return '%02d/%02d/%04d' % (value.month, value.day, value.year)
+
+
+def get_kind(datetimestr: str):
+    if 'T' in datetimestr and '+' in datetimestr:
+        return 'timestamp'
+    elif '/' in datetimestr:
+        return 'date'
+    return None
+
+
+def get_number_formats(loc=None):
+    if loc is None:
+        loc = locale.getlocale()
+    if (loc[0] or '').startswith('de'):
+        return {'timestamp': 'dd.mm.yyyy HH:MM:SS', 'date': 'dd.mm.yyyy'}
+    return {'timestamp': 'mm/dd/yyyy HH:MM:SS', 'date': 'mm/dd/yyyy'}
+
+
+def get_number_format(datetimestr: str, number_formats: dict):
+    kind = get_kind(datetimestr)
+    if kind is None:
+        return ''
+    return number_formats[kind]
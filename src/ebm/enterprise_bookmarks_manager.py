@@ -32,16 +32,13 @@
 # ---------------------------------------------------------------------------
 
 import argparse
+import multiprocessing
 import sys
 
 try:
-    import src.ebm.bm2xls as bm2xls
     import src.ebm.utils as utils
-    import src.ebm.xls2bm as xls2bm
 except ModuleNotFoundError:
-    import bm2xls
     import utils
-    import xls2bm
 
 __author__ = 'Roland Rickborn'
 __copyright__ = 'Copyright (c) 2025 {}'.format(__author__)
@@ -50,6 +47,44 @@ __url__ = 'https://github.com/gitRigge/EnterpriseBookmarksManager'
 __license__ = 'MIT License (MIT)' + ', ' + __copyright__
 
 
+def convert_excel_to_csv(filename: str, streaming: bool = False,
+                         jobs: int = 1, executor: str = 'process',
+                         pipelined: bool = False):
+    # The converters pull in openpyxl and validators, so they are
+    # only imported once a file is actually converted
+    try:
+        import src.ebm.pipeline as pipeline
+        import src.ebm.xls2bm as xls2bm
+    except ModuleNotFoundError:
+        import pipeline
+        import xls2bm
+    if not pipelined:
+        return xls2bm.convert_excel_to_csv(
+            filename, streaming=streaming, jobs=jobs, executor=executor)
+    my_pipeline = pipeline.Pipeline()
+    retval = xls2bm.convert_excel_to_csv(
+        filename, jobs=jobs, executor=executor, my_pipeline=my_pipeline)
+    print(my_pipeline.get_report())
+    return retval
+
+
+def get_excel_options(args):
+    return {
+        'streaming': args.stream,
+        'jobs': args.jobs,
+        'executor': args.executor,
+        'pipelined': args.pipeline
+    }
+
+
+def convert_csv_to_excel(filename: str):
+    try:
+        import src.ebm.bm2xls as bm2xls
+    except ModuleNotFoundError:
+        import bm2xls
+    return bm2xls.convert_csv_to_excel(filename)
+
+
 def run_from_command_line(args):
     if args.countries:
         utils.print_countries()
@@ -75,18 +110,20 @@ def run_from_command_line(args):
             if user_input.lower() == 'yes' or user_input.lower() == 'y':
                 if candidate.endswith('.xlsx'):
                     filename = '{}'.format(candidate).split('.')[0]
-                    output = xls2bm.convert_excel_to_csv(filename)
+                    output = convert_excel_to_csv(
+                        filename, **get_excel_options(args))
                 else:
                     filename = '{}'.format(candidate).split('.')[0]
-                    output = bm2xls.convert_csv_to_excel(filename)
+                    output = convert_csv_to_excel(filename)
             else:
                 user_input = input('Enter the filename to read: ')
                 if user_input.endswith('.xlsx'):
                     filename = '{}'.format(user_input).split('.')[0]
-                    output = xls2bm.convert_excel_to_csv(filename)
+                    output = convert_excel_to_csv(
+                        filename, **get_excel_options(args))
                 elif user_input.endswith('.csv'):
                     filename = '{}'.format(user_input).split('.')[0]
-                    output = bm2xls.convert_csv_to_excel(filename)
+                    output = convert_csv_to_excel(filename)
                 else:
                     print('Wrong file format - exit')
                     sys.exit(13)
@@ -95,10 +132,11 @@ def run_from_command_line(args):
             sys.exit(0)
     elif args.inputfile.endswith('.xlsx'):
         filename = '{}'.format(args.inputfile).split('.')[0]
-        output = xls2bm.convert_excel_to_csv(filename)
+        output = convert_excel_to_csv(
+            filename, **get_excel_options(args))
     elif args.inputfile.endswith('.csv'):
         filename = '{}'.format(args.inputfile).split('.')[0]
-        output = bm2xls.convert_csv_to_excel(filename)
+        output = convert_csv_to_excel(filename)
     print('Output file: {}'.format(output))
 
 
@@ -111,6 +149,23 @@ def main(argv=None):
     parser.add_argument(
         '-i', '--inputfile', action='store', type=str,
         help='Specify input file to read (Excel or CSV)')
+    parser.add_argument(
+        '--stream', action='store_true',
+        help='Convert Excel files row by row without keeping all '
+             'bookmarks in memory')
+    parser.add_argument(
+        '-j', '--jobs', action='store', type=int, default=1,
+        help='Validate the bookmarks of Excel files in this many '
+             'processes or threads')
+    parser.add_argument(
+        '--executor', action='store', choices=['process', 'thread'],
+        default='process',
+        help='Run the jobs in processes or, on free-threaded Python '
+             'builds, in threads')
+    parser.add_argument(
+        '--pipeline', action='store_true',
+        help='Read, validate and write Excel files in overlapping stages '
+             'and show their counters')
     parser.add_argument(
         '-c', '--countries', action='store_true',
         help='Show list of ISO country codes and exit')
@@ -134,4 +189,7 @@ def main(argv=None):
 
 
 if __name__ == "__main__":
+    # In the frozen exe, the workers of --jobs start the exe again; they
+    # must run the pool worker instead of the command line
+    multiprocessing.freeze_support()
     main()
@@ -25,38 +25,69 @@
 #
 # ---------------------------------------------------------------------------
 
-import pycountry
+import functools
+import types
+
+try:
+    import src.ebm.country_codes as country_codes
+except ModuleNotFoundError:
+    import country_codes
+
+DEVICES = types.MappingProxyType({
+    'pc-windows': 'PC - Windows',
+    'pc-mac': 'PC - Apple Mac',
+    'mobile-ios': 'Mobile - iOS',
+    'mobile-android': 'Mobile - Android'
+})
+
+STATUS = types.MappingProxyType({
+    'published': 'Published',
+    'draft': 'Draft',
+    'scheduled': 'Scheduled',
+    'suggested': 'Suggested',
+    'excluded': 'Excluded',
+    'expired': 'Expired'
+})
+
+VARIATIONS = types.MappingProxyType({
+    'title': '<your title>',
+    'url': '<your URL>',
+    'description': '<your description>',
+    'country': '<your country>',
+    'device': '<your device>'
+})
+
+DEVICE_CODES = frozenset(DEVICES)
+STATUS_CODES = frozenset(STATUS)
+VARIATION_KEYS = frozenset(VARIATIONS)
+
+
+@functools.lru_cache(maxsize=None)
+def get_countries(use_pycountry: bool = False):
+    # Built once per process on first use; the read-only proxy may be
+    # shared freely between threads and is inherited by forked workers.
+    # The generated table is used unless pycountry is explicitly asked for.
+    if use_pycountry:
+        import pycountry
+        return types.MappingProxyType({
+            country.alpha_2.lower(): country.name
+            for country in pycountry.countries})
+    return types.MappingProxyType(dict(country_codes.COUNTRIES))
+
+
+@functools.lru_cache(maxsize=None)
+def get_country_codes(use_pycountry: bool = False):
+    return frozenset(get_countries(use_pycountry))
 
 
 class Enums(object):
 
-    devices = {
-        'pc-windows': 'PC - Windows',
-        'pc-mac': 'PC - Apple Mac',
-        'mobile-ios': 'Mobile - iOS',
-        'mobile-android': 'Mobile - Android'
-    }
-
-    status = {
-        'published': 'Published',
-        'draft': 'Draft',
-        'scheduled': 'Scheduled',
-        'suggested': 'Suggested',
-        'excluded': 'Excluded',
-        'expired': 'Expired'
-    }
-
-    countries = {}
-
-    variations = {
-        'title': '<your title>',
-        'url': '<your URL>',
-        'description': '<your description>',
-        'country': '<your country>',
-        'device': '<your device>'
-    }
-
-    def __init__(self):
-        all_countries = list(pycountry.countries)
-        for country in all_countries:
-            self.countries[country.alpha_2.lower()] = country.name
+    devices = DEVICES
+
+    status = STATUS
+
+    variations = VARIATIONS
+
+    @property
+    def countries(self):
+        return get_countries()
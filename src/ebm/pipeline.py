@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# The MIT License (MIT)
+#
+# Copyright (c) 2025, Roland Rickborn (r_2@gmx.net)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+# ---------------------------------------------------------------------------
+
+import queue
+import threading
+import time
+
+# Put on a queue by the producing stage once it has no more items
+END = object()
+
+
+class PipelineStopped(Exception):
+    pass
+
+
+class StageCounters(object):
+
+    def __init__(self, name: str):
+        self.name = name
+        self.items = 0
+        self.waiting = 0.0
+        self.started = None
+        self.finished = None
+
+    def get_elapsed(self):
+        if self.started is None:
+            return 0.0
+        finished = self.finished
+        if finished is None:
+            finished = time.perf_counter()
+        return finished - self.started
+
+    def get_busy(self):
+        # Time the stage did its own work, not waiting on its queues
+        return max(self.get_elapsed() - self.waiting, 0.0)
+
+    def get_throughput(self):
+        elapsed = self.get_elapsed()
+        return self.items / elapsed if elapsed else 0.0
+
+
+class BoundedQueue(object):
+
+    # A full queue blocks the producing stage (backpressure); both sides
+    # give up as soon as another stage failed
+    def __init__(self, name: str, maxsize: int, stopped: threading.Event):
+        self.name = name
+        self.maxsize = maxsize
+        self.queue = queue.Queue(maxsize)
+        self.stopped = stopped
+        self.max_depth = 0
+        self.depth_sum = 0
+        self.samples = 0
+
+    def put(self, item, counters: StageCounters):
+        start = time.perf_counter()
+        while True:
+            if self.stopped.is_set():
+                raise PipelineStopped()
+            try:
+                self.queue.put(item, timeout=0.1)
+                break
+            except queue.Full:
+                continue
+        counters.waiting += time.perf_counter() - start
+        self.sample()
+
+    def get(self, counters: StageCounters):
+        start = time.perf_counter()
+        while True:
+            if self.stopped.is_set():
+                raise PipelineStopped()
+            try:
+                item = self.queue.get(timeout=0.1)
+                break
+            except queue.Empty:
+                continue
+        counters.waiting += time.perf_counter() - start
+        self.sample()
+        return item
+
+    def close(self, counters: StageCounters):
+        self.put(END, counters)
+
+    def iter_items(self, counters: StageCounters):
+        while True:
+            item = self.get(counters)
+            if item is END:
+                return
+            yield item
+
+    def sample(self):
+        depth = self.queue.qsize()
+        self.max_depth = max(self.max_depth, depth)
+        self.depth_sum += depth
+        self.samples += 1
+
+    def get_mean_depth(self):
+        return self.depth_sum / self.samples if self.samples else 0.0
+
+
+class Pipeline(object):
+
+    def __init__(self, queue_size: int = 8):
+        self.queue_size = queue_size
+        self.stopped = threading.Event()
+        self.stages = []
+        self.queues = []
+        self.threads = []
+        self.errors = []
+
+    def add_stage(self, name: str):
+        counters = StageCounters(name)
+        self.stages.append(counters)
+        return counters
+
+    def add_queue(self, name: str):
+        my_queue = BoundedQueue(name, self.queue_size, self.stopped)
+        self.queues.append(my_queue)
+        return my_queue
+
+    def run_stage(self, counters: StageCounters, target, *args):
+        counters.started = time.perf_counter()
+        try:
+            target(*args)
+        except PipelineStopped:
+            pass
+        except BaseException as e:
+            # Only the first failure is the cause; the other stages
+            # stop because of it
+            self.errors.append(e)
+            self.stopped.set()
+        finally:
+            counters.finished = time.perf_counter()
+
+    def start_thread(self, counters: StageCounters, target, *args):
+        thread = threading.Thread(
+            target=self.run_stage, args=(counters, target) + args,
+            name='ebm-{}'.format(counters.name), daemon=True)
+        self.threads.append(thread)
+        thread.start()
+
+    def run(self, counters: StageCounters, target, *args):
+        # Runs the given stage in this thread and waits for all others
+        try:
+            self.run_stage(counters, target, *args)
+        finally:
+            for thread in self.threads:
+                thread.join()
+        if self.errors:
+            raise self.errors[0]
+
+    def get_report(self):
+        lines = ['{:<10} {:>9} {:>9} {:>9} {:>11}'.format(
+            'Stage', 'Items', 'Busy s', 'Waiting s', 'Items/s')]
+        for counters in self.stages:
+            lines.append('{:<10} {:>9} {:>9.3f} {:>9.3f} {:>11.0f}'.format(
+                counters.name, counters.items, counters.get_busy(),
+                counters.waiting, counters.get_throughput()))
+        lines.append('{:<10} {:>9} {:>9} {:>9}'.format(
+            'Queue', 'Size', 'Max', 'Mean'))
+        for my_queue in self.queues:
+            lines.append('{:<10} {:>9} {:>9} {:>9.1f}'.format(
+                my_queue.name, my_queue.maxsize, my_queue.max_depth,
+                my_queue.get_mean_depth()))
+        return '\n'.join(lines)
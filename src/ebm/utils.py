@@ -27,6 +27,7 @@
 
 import glob
 import os
+import sys
 from os.path import exists
 
 try:
@@ -64,24 +65,30 @@ def get_most_possible_file():
     return retval
 
 
+def is_gil_enabled():
+    # sys._is_gil_enabled() only exists since Python 3.13
+    is_enabled = getattr(sys, '_is_gil_enabled', None)
+    return is_enabled is None or is_enabled()
+
+
 def print_devices():
     print('Allowed Devices are:')
-    print(', '.join(list(enums.Enums().devices.values())))
+    print(', '.join(enums.DEVICES.values()))
 
 
 def print_status():
     print('Allowed Status are:')
-    print(', '.join(list(enums.Enums().status.values())))
+    print(', '.join(enums.STATUS.values()))
 
 
 def print_countries():
     print('Allowed Country Codes are:')
-    print(', '.join(list(enums.Enums().countries.keys())))
+    print(', '.join(enums.get_countries().keys()))
 
 
 def print_variations():
     print('Template Variations:')
-    print('[{},{{...}}]'.format(enums.Enums().variations))
+    print('[{},{{...}}]'.format(dict(enums.VARIATIONS)))
     print('\nThe usage of \'title\', \'url\', \'description\', ' +
           'and \'device\' is optional.')
     print('\nExample:')
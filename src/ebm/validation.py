@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# The MIT License (MIT)
+#
+# Copyright (c) 2025, Roland Rickborn (r_2@gmx.net)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+# ---------------------------------------------------------------------------
+
+import re
+import urllib.parse
+
+import validators
+
+# Subset of http(s) URLs that validators.url accepts: a dotted host name,
+# an optional port and a plain path. Everything else is left to validators.
+URL_PATTERN = re.compile(
+    r'https?://'
+    r'(?P<host>(?:[a-z0-9](?:[a-z0-9-]{0,61}[a-z0-9])?\.)+'
+    r'[a-z0-9][a-z0-9-]{0,61}[a-z])'
+    r'(?::(?:6553[0-5]|655[0-2][0-9]|65[0-4][0-9]{2}|6[0-4][0-9]{3}|'
+    r'[1-5][0-9]{4}|[1-9][0-9]{0,3}))?'
+    r'(?:/[/a-z0-9\-._~!$&\'()*+,;=:@%]*)?',
+    re.I | re.A)
+# http(s) URLs whose host has neither a dot nor a port can be no domain
+# and no IP address, so validators.url rejects them
+UNDOTTED_URL_PATTERN = re.compile(
+    r'https?://[a-z0-9-]*[a-z-][a-z0-9-]*'
+    r'(?:/[/a-z0-9\-._~!$&\'()*+,;=:@%]*)?',
+    re.I | re.A)
+ALIAS_PATTERN = re.compile(r'^http[s]?:\/\/[\w|-]{3,}\/?$', re.I)
+UUID_PATTERN = re.compile(
+    r'[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}',
+    re.I | re.A)
+
+
+def validate_url(url):
+    if isinstance(url, str):
+        match = URL_PATTERN.fullmatch(url)
+        if match and len(match.group('host')) <= 253:
+            return True
+        if UNDOTTED_URL_PATTERN.fullmatch(url):
+            return False
+    return bool(validators.url(url))
+
+
+def validate_alias_url(url: str):
+    u = urllib.parse.urlparse(url)
+    alias = '{}://{}'.format(u.scheme, u.hostname)
+    if ALIAS_PATTERN.match(alias):
+        return True
+    return False
+
+
+def validate_uuid(uuid):
+    if isinstance(uuid, str) and UUID_PATTERN.fullmatch(uuid):
+        return True
+    return bool(validators.uuid(uuid))
+
+
+def validate_urls(urls):
+    return validate_column(urls, validate_url)
+
+
+def validate_uuids(uuids):
+    return validate_column(uuids, validate_uuid)
+
+
+def validate_column(values, validator):
+    # Columns repeat the same hosts and groups a lot, so every distinct
+    # value is only validated once
+    results = {}
+    retval = []
+    for value in values:
+        try:
+            result = results[value]
+        except KeyError:
+            result = results[value] = validator(value)
+        except TypeError:
+            result = validator(value)
+        retval.append(result)
+    return retval
@@ -25,8 +25,13 @@
 #
 # ---------------------------------------------------------------------------
 
+import collections
+import concurrent.futures
 import csv
-import math
+import datetime
+import io
+import itertools
+import os
 import sys
 
 import openpyxl
@@ -34,62 +39,210 @@ import openpyxl
 try:
     import src.ebm.bookmark as bookmark
     import src.ebm.bookmark_shelf as bookmark_shelf
+    import src.ebm.pipeline as pipeline
     import src.ebm.utils as utils
 except ModuleNotFoundError:
     import bookmark
     import bookmark_shelf
+    import pipeline
     import utils
 
+CHUNK_SIZE = 500
+CACHE_SIZE = 10000
+
 
 def write_init_output_file(outputFilename: str, outputColumns: list):
+    return write_output_file(outputFilename, outputColumns, [])
+
+
+def write_output_file(outputFilename: str, outputColumns: list, rows):
     outputFilename = utils.get_save_filename(outputFilename)
     retval = outputFilename
-    with open(outputFilename, 'w', newline='', encoding='utf-8') as csvfile:
-        csvwriter = csv.writer(
-            csvfile, delimiter=',', quotechar='"', quoting=csv.QUOTE_MINIMAL)
-        outputColumns[0] = u'\uFEFF' + outputColumns[0]
-        csvwriter.writerow(outputColumns)
+    csvfile = open(outputFilename, 'w', newline='', encoding='utf-8')
+    try:
+        with csvfile:
+            write_csv(csvfile, outputColumns, rows)
+    except Exception:
+        os.remove(outputFilename)
+        raise
     return retval
 
 
+def write_csv(csvfile, outputColumns: list, rows):
+    csvwriter = csv.writer(
+        csvfile, delimiter=',', quotechar='"', quoting=csv.QUOTE_MINIMAL)
+    csvwriter.writerow(
+        [u'\uFEFF' + outputColumns[0]] + list(outputColumns[1:]))
+    csvwriter.writerows(rows)
+
+
+def write_output_files(filename: str, rows, limit: int = 3000):
+    retval = []
+    try:
+        write_output_chunks(filename, rows, limit, retval)
+    except Exception:
+        # Rows may be validated while they are written, so an invalid row
+        # must not leave the files of the previous chunks behind
+        for output_filename in retval:
+            os.remove(output_filename)
+        raise
+    return retval
+
+
+def write_output_chunks(filename: str, rows, limit: int, retval: list):
+    my_output_columns = list(bookmark.Bookmark.get_columns().values())
+    for counter, chunk in iter_output_chunks(rows, limit):
+        if counter is None:
+            output_filename = '{}.csv'.format(filename)
+        else:
+            output_filename = '{}_{}.csv'.format(filename, counter)
+        retval.append(write_output_file(
+            output_filename, my_output_columns, chunk))
+
+
+def iter_output_chunks(rows, limit: int):
+    # Yields the rows of each output file with its counter, which is None
+    # if all rows fit into one file. Each chunk must be consumed before
+    # the next one is taken.
+    rows = iter(rows)
+    # The first chunk is buffered to decide whether more than one output
+    # file is needed; all following rows are streamed chunk by chunk.
+    first_chunk = list(itertools.islice(rows, limit))
+    next_row = next(rows, None)
+    if next_row is None:
+        yield None, first_chunk
+        return
+    rows = itertools.chain(first_chunk, [next_row], rows)
+    counter = 0
+    for first_row in rows:
+        counter += 1
+        yield counter, itertools.chain(
+            [first_row], itertools.islice(rows, limit - 1))
+
+
+def get_output_row(data: list):
+    return [str(item).replace('\n', '') for item in data]
+
+
 def append_to_output_file(outputfile: str, data: list):
     with open(outputfile, 'a', newline='', encoding='utf-8') as csvfile:
         csvwriter = csv.writer(
             csvfile, delimiter=',', quotechar='"', quoting=csv.QUOTE_MINIMAL)
-        new_line = []
-        for item in data:
-            new_line.append(str(item).replace('\n', ''))
-        csvwriter.writerow(new_line)
+        csvwriter.writerow(get_output_row(data))
 
 
-def read_input_file(filename: str):
-    retval = bookmark_shelf.BookmarkShelf()
+def iter_input_rows(input_filename: str):
+    width = len(bookmark.Bookmark.get_columns())
+    wb = openpyxl.load_workbook(input_filename, read_only=True)
     try:
-        wb = openpyxl.load_workbook('{}.xlsx'.format(filename))
         ws = wb.active
-        for r in range(2, ws.max_row+1):
-            my_bookmark = bookmark.Bookmark(
-                title=ws['{}{}'.format('A', r)].value,
-                url=ws['{}{}'.format('B', r)].value,
-                keywords=ws['{}{}'.format('C', r)].value,
-                match_similar_keywords=ws['{}{}'.format('D', r)].value,
-                state=ws['{}{}'.format('E', r)].value,
-                description=ws['{}{}'.format('F', r)].value,
-                reserved_keywords=ws['{}{}'.format('G', r)].value,
-                categories=ws['{}{}'.format('H', r)].value,
-                start_date=ws['{}{}'.format('I', r)].value,
-                end_date=ws['{}{}'.format('J', r)].value,
-                country_region=ws['{}{}'.format('K', r)].value,
-                use_aad_location=ws['{}{}'.format('L', r)].value,
-                groups=ws['{}{}'.format('M', r)].value,
-                device_and_os=ws['{}{}'.format('N', r)].value,
-                targeted_variations=ws['{}{}'.format('O', r)].value,
-                last_modified=ws['{}{}'.format('P', r)].value,
-                last_modified_by=ws['{}{}'.format('Q', r)].value,
-                id=ws['{}{}'.format('R', r)].value
-            )
-            retval.add_bookmark(my_bookmark)
-        return retval
+        for row in ws.iter_rows(min_row=2, max_col=width, values_only=True):
+            yield row
+    finally:
+        wb.close()
+
+
+def build_bookmarks(rows: list, now: datetime.datetime):
+    # Runs in a worker process or thread with a context of its own. The
+    # notices of each row are handed back with it, so they are printed in
+    # row order by the main thread.
+    context = bookmark.ValidationContext(now)
+    retval = []
+    for item in bookmark.Bookmark.from_rows(rows, context):
+        retval.append(item)
+        if item[2] is not None:
+            break
+    return retval
+
+
+def iter_row_chunks(rows, chunk_size: int = CHUNK_SIZE):
+    rows = iter(rows)
+    return iter(lambda: list(itertools.islice(rows, chunk_size)), [])
+
+
+def get_executor(executor: str, jobs: int):
+    if executor == 'thread':
+        return concurrent.futures.ThreadPoolExecutor(jobs)
+    if executor == 'process':
+        return concurrent.futures.ProcessPoolExecutor(jobs)
+    raise ValueError('Unknown executor \'{}\''.format(executor))
+
+
+def iter_built_bookmarks(rows, now: datetime.datetime, jobs: int,
+                         chunk_size: int = CHUNK_SIZE,
+                         executor: str = 'process'):
+    chunks = iter_row_chunks(rows, chunk_size)
+    executor = get_executor(executor, jobs)
+    pending = collections.deque()
+    try:
+        # A few chunks per worker are in flight, so rows are still read
+        # while the first results are admitted
+        for chunk in chunks:
+            pending.append(executor.submit(build_bookmarks, chunk, now))
+            if len(pending) > 2 * jobs:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+    finally:
+        executor.shutdown(cancel_futures=True)
+
+
+def iter_bookmarks(filename: str, shelf: bookmark_shelf.BookmarkShelf,
+                   lazy: bool = False, jobs: int = 1,
+                   executor: str = 'process'):
+    return iter_admitted_bookmarks(
+        iter_input_rows('{}.xlsx'.format(filename)), shelf, lazy=lazy,
+        jobs=jobs, executor=executor)
+
+
+def iter_admitted_bookmarks(rows, shelf: bookmark_shelf.BookmarkShelf,
+                            lazy: bool = False, jobs: int = 1,
+                            executor: str = 'process',
+                            context: bookmark.ValidationContext = None):
+    if context is None:
+        # Without kept bookmarks the rows are not held either, so the caches
+        # of a long run must not grow with the number of rows
+        context = bookmark.ValidationContext(
+            cache_size=None if shelf.keep_bookmarks else CACHE_SIZE)
+    if executor == 'thread' and utils.is_gil_enabled():
+        # Validation is pure Python, so threads only run in parallel on
+        # free-threaded builds; otherwise this thread does the work
+        jobs = 1
+    if not lazy:
+        if jobs > 1:
+            # Bookmarks are validated in parallel; the shelf admission,
+            # which depends on the rows before, stays in the original row
+            # order
+            built = iter_built_bookmarks(
+                rows, context.now, jobs, executor=executor)
+        else:
+            # Each chunk is validated column by column, so repeated cells
+            # are parsed once
+            built = itertools.chain.from_iterable(
+                bookmark.Bookmark.from_rows(chunk, context)
+                for chunk in iter_row_chunks(rows))
+        for my_bookmark, notices, error in built:
+            for notice in notices:
+                context.notify(notice)
+            if error is not None:
+                raise error
+            shelf.add_bookmark(my_bookmark)
+            yield my_bookmark
+        return
+    # Lazy bookmarks are only checked for what the shelf admission reads
+    for row in rows:
+        my_bookmark = bookmark.LazyBookmark.from_row(row, context=context)
+        shelf.add_bookmark(my_bookmark)
+        yield my_bookmark
+
+
+def read_input_file(filename: str, compact: bool = False,
+                    lazy: bool = False, jobs: int = 1,
+                    executor: str = 'process'):
+    try:
+        return read_input_stream(
+            '{}.xlsx'.format(filename), compact=compact, lazy=lazy,
+            jobs=jobs, executor=executor)
     except bookmark.ValidationError as e:
         print(e)
         sys.exit(1)
@@ -98,33 +251,144 @@ def read_input_file(filename: str):
         sys.exit(2)
 
 
-def convert_excel_to_csv(filename: str):
-    retval = []
-    my_output_columns = list(bookmark.Bookmark.get_columns().values())
-    my_shelf = read_input_file(filename)
-    limit = 3000
-    counter = 0
-    number_of_files = math.ceil(len(my_shelf.get_bookmarks())/limit)
-    if number_of_files > 1:
-        for i in range(0, number_of_files):
-            my_output_filename = write_init_output_file('{}_{}.csv'.format(
-                filename, i+1), my_output_columns)
-            retval.append(my_output_filename)
-            for j in range(0, limit):
-                my_keys = list(my_shelf.get_bookmarks())
-                if counter < len(my_keys):
-                    my_bm = my_shelf.get_bookmark(my_keys[counter])
-                    append_to_output_file(
-                        my_output_filename, my_bm.to_string())
-                    counter += 1
+def read_input_stream(input_file, compact: bool = False, lazy: bool = False,
+                      jobs: int = 1, executor: str = 'process'):
+    # input_file is a binary stream or the name of a workbook
+    retval = bookmark_shelf.BookmarkShelf(compact=compact)
+    for _ in iter_admitted_bookmarks(
+            iter_input_rows(get_seekable(input_file)), retval, lazy=lazy,
+            jobs=jobs, executor=executor):
+        pass
+    return retval
+
+
+def get_seekable(input_file):
+    # openpyxl reads the directory at the end of the zip file first, so
+    # pipes and sockets are read into memory
+    if isinstance(input_file, (str, os.PathLike)) or input_file.seekable():
+        return input_file
+    return io.BytesIO(input_file.read())
+
+
+def iter_output_rows(input_file, streaming: bool = False, jobs: int = 1,
+                     executor: str = 'process'):
+    if streaming:
+        # Only the admission indexes of the shelf are kept in memory
+        my_shelf = bookmark_shelf.BookmarkShelf(keep_bookmarks=False)
+        bookmarks = iter_admitted_bookmarks(
+            iter_input_rows(get_seekable(input_file)), my_shelf, jobs=jobs,
+            executor=executor)
     else:
-        my_output_filename = write_init_output_file('{}.csv'.format(
-            filename), my_output_columns)
-        retval.append(my_output_filename)
-        for j in range(0, limit):
-            my_keys = list(my_shelf.get_bookmarks())
-            if counter < len(my_keys):
-                my_bm = my_shelf.get_bookmark(my_keys[counter])
-                append_to_output_file(my_output_filename, my_bm.to_string())
-                counter += 1
-    return ', '.join(retval)
+        # All rows are checked before the first one is written
+        bookmarks = read_input_stream(
+            input_file, compact=True, jobs=jobs,
+            executor=executor).get_bookmarks().values()
+    return (get_output_row(bm.to_string()) for bm in bookmarks)
+
+
+def write_output_streams(rows, open_output=None, limit: int = 3000):
+    # open_output(counter) returns the text stream of each chunk of at most
+    # limit rows; counter is None if all rows fit into one stream
+    if open_output is None:
+        def open_output(counter):
+            return io.StringIO(newline='')
+    my_output_columns = list(bookmark.Bookmark.get_columns().values())
+    retval = []
+    for counter, chunk in iter_output_chunks(rows, limit):
+        output_file = open_output(counter)
+        write_csv(output_file, my_output_columns, chunk)
+        retval.append(output_file)
+    return retval
+
+
+def convert_excel_stream(input_file, open_output=None,
+                         streaming: bool = False, jobs: int = 1,
+                         executor: str = 'process', limit: int = 3000):
+    # Converts a workbook read from a binary stream without touching the
+    # file system; returns the text streams written to, which are
+    # StringIO objects unless open_output is given
+    return write_output_streams(
+        iter_output_rows(input_file, streaming=streaming, jobs=jobs,
+                         executor=executor), open_output, limit)
+
+
+def read_row_chunks(filename: str, rows_queue: pipeline.BoundedQueue,
+                    counters: pipeline.StageCounters, chunk_size: int):
+    rows = iter_input_rows('{}.xlsx'.format(filename))
+    try:
+        for chunk in iter(lambda: list(itertools.islice(rows, chunk_size)),
+                          []):
+            counters.items += len(chunk)
+            rows_queue.put(chunk, counters)
+        rows_queue.close(counters)
+    finally:
+        rows.close()
+
+
+def validate_row_chunks(rows_queue: pipeline.BoundedQueue,
+                        output_queue: pipeline.BoundedQueue,
+                        counters: pipeline.StageCounters, chunk_size: int,
+                        jobs: int, executor: str):
+    # Only the admission indexes of the shelf are kept, like in streaming
+    # mode, since the rows are written while later ones are validated
+    my_shelf = bookmark_shelf.BookmarkShelf(keep_bookmarks=False)
+    rows = itertools.chain.from_iterable(rows_queue.iter_items(counters))
+    output_rows = (
+        get_output_row(bm.to_string()) for bm in iter_admitted_bookmarks(
+            rows, my_shelf, jobs=jobs, executor=executor))
+    for chunk in iter(lambda: list(itertools.islice(output_rows, chunk_size)),
+                      []):
+        counters.items += len(chunk)
+        output_queue.put(chunk, counters)
+    output_queue.close(counters)
+
+
+def write_row_chunks(filename: str, output_queue: pipeline.BoundedQueue,
+                     counters: pipeline.StageCounters, retval: list):
+    def iter_rows():
+        for chunk in output_queue.iter_items(counters):
+            counters.items += len(chunk)
+            yield from chunk
+    retval.extend(write_output_files(filename, iter_rows()))
+
+
+def run_pipeline(filename: str, my_pipeline: pipeline.Pipeline,
+                 jobs: int = 1, executor: str = 'process',
+                 chunk_size: int = CHUNK_SIZE):
+    # The workbook is read and the CSV files are written in threads of
+    # their own, so zip and XML decoding and disk I/O overlap with the
+    # validation in this thread
+    rows_queue = my_pipeline.add_queue('rows')
+    output_queue = my_pipeline.add_queue('output')
+    read = my_pipeline.add_stage('read')
+    validate = my_pipeline.add_stage('validate')
+    write = my_pipeline.add_stage('write')
+    retval = []
+    my_pipeline.start_thread(
+        read, read_row_chunks, filename, rows_queue, read, chunk_size)
+    my_pipeline.start_thread(
+        write, write_row_chunks, filename, output_queue, write, retval)
+    my_pipeline.run(
+        validate, validate_row_chunks, rows_queue, output_queue, validate,
+        chunk_size, jobs, executor)
+    return retval
+
+
+def convert_excel_to_csv(filename: str, streaming: bool = False,
+                         jobs: int = 1, executor: str = 'process',
+                         my_pipeline: pipeline.Pipeline = None):
+    try:
+        if my_pipeline is not None:
+            return ', '.join(run_pipeline(
+                filename, my_pipeline, jobs=jobs, executor=executor))
+        with open('{}.xlsx'.format(filename), 'rb') as input_file:
+            rows = iter_output_rows(
+                input_file, streaming=streaming, jobs=jobs,
+                executor=executor)
+            return ', '.join(write_output_files(filename, rows))
+    except bookmark.ValidationError as e:
+        print(e)
+        sys.exit(1)
+    except FileNotFoundError as e:
+        print(e)
+        sys.exit(2)
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# The MIT License (MIT)
+#
+# Copyright (c) 2025, Roland Rickborn (r_2@gmx.net)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+# ---------------------------------------------------------------------------
+
+import base64
+
+import openpyxl
+import pytest
+
+import src.ebm.bookmark as bookmark
+import src.ebm.xls2bm as xls2bm
+import tests.ebm_fixtures as fix
+
+
+@pytest.fixture
+def write_workbook():
+    # Writes the header row and the given rows to a filename or a binary
+    # stream
+    def write(output, rows):
+        wb = openpyxl.Workbook()
+        wb.active.append(list(bookmark.Bookmark.get_columns().values()))
+        for row in rows:
+            wb.active.append(row)
+        wb.save(output)
+    return write
+
+
+@pytest.fixture
+def convert_big_workbook():
+    # Converts TEST_XLSX_FILE_BIG in a folder and returns the CSV contents
+    def convert(folder, **kwargs):
+        folder.mkdir(exist_ok=True)
+        with open(folder / 'big.xlsx', 'wb') as f:
+            f.write(base64.b64decode(b''.join(fix.TEST_XLSX_FILE_BIG)))
+        retval = []
+        for name in xls2bm.convert_excel_to_csv(
+                str(folder / 'big'), **kwargs).split(', '):
+            with open(name, encoding='utf-8', newline='') as f:
+                retval.append(f.read())
+        return retval
+    return convert
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# The MIT License (MIT)
+#
+# Copyright (c) 2025, Roland Rickborn (r_2@gmx.net)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+# ---------------------------------------------------------------------------
+
+import asyncio
+import base64
+import io
+import threading
+import time
+
+import openpyxl
+import pytest
+
+import src.ebm.async_convert as async_convert
+import src.ebm.bm2xls as bm2xls
+import src.ebm.bookmark as bookmark
+import src.ebm.xls2bm as xls2bm
+import tests.ebm_fixtures as fix
+
+
+@pytest.fixture(scope='module')
+def xlsx_data():
+    return base64.b64decode(b''.join(fix.TEST_XLSX_FILE_BIG))
+
+
+class TestAsyncExcelToCsv(object):
+
+    def test_like_files(self, xlsx_data, tmp_path, convert_big_workbook):
+        expected = convert_big_workbook(tmp_path)
+        events = []
+        result = asyncio.run(async_convert.convert_excel_to_csv(
+            xlsx_data, progress=events.append))
+        assert [data.decode('utf-8') for data in result] == expected
+        assert events[0].stage == 'read'
+        assert events[0].count == len(xlsx_data)
+        counts = [e.count for e in events if e.stage == 'rows']
+        assert counts == list(range(500, 5072, 500)) + [5072]
+
+    def test_streams(self, xlsx_data):
+        async def convert():
+            reader = asyncio.StreamReader()
+            reader.feed_data(xlsx_data)
+            reader.feed_eof()
+            return await asyncio.gather(
+                async_convert.convert_excel_to_csv(reader),
+                async_convert.convert_excel_to_csv(
+                    io.BytesIO(xlsx_data), jobs=2))
+
+        from_reader, from_file = asyncio.run(convert())
+        assert len(from_reader) == 2
+        assert from_reader == from_file
+
+    def test_notices_and_errors(self, write_workbook):
+        rows = [
+            ('{} long'.format(fix.TITLE_BAD), fix.URL_GOOD, 'test-1', None,
+             'published'),
+            ('Test 2', fix.URL_BAD, 'test-2', None, 'published')
+        ]
+        data = io.BytesIO()
+        write_workbook(data, rows)
+        events = []
+        with pytest.raises(bookmark.ValidationError) as e:
+            asyncio.run(async_convert.convert_excel_to_csv(
+                data.getvalue(), progress=events.append))
+        assert str(e.value) == 'URL of \'Test 2\' could not be validated'
+        assert [e.message for e in events if e.stage == 'notice'] == [
+            'Title has been shortened to \'{}...\''.format(
+                fix.TITLE_BAD[:57])]
+
+    def test_event_loop_not_blocked(self, xlsx_data):
+        async def convert():
+            ticks = 0
+            task = asyncio.ensure_future(
+                async_convert.convert_excel_to_csv(xlsx_data))
+            while not task.done():
+                await asyncio.sleep(0.01)
+                ticks += 1
+            return ticks, task.result()
+
+        ticks, result = asyncio.run(convert())
+        assert ticks > 5
+        assert len(result) == 2
+
+    def test_cancel(self, xlsx_data, mocker):
+        spy = mocker.spy(xls2bm, 'get_output_row')
+
+        async def convert():
+            def progress(event):
+                if event.stage == 'rows':
+                    task.cancel()
+
+            task = asyncio.ensure_future(async_convert.convert_excel_to_csv(
+                xlsx_data, progress=progress))
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        asyncio.run(convert())
+        # The conversion stopped once it saw the cancellation
+        count = spy.call_count
+        assert 500 <= count < 5072
+        time.sleep(0.1)
+        assert spy.call_count == count
+
+    @pytest.mark.parametrize('error', [
+        async_convert.ConversionCancelled, ValueError])
+    def test_cancel_while_waiting(self, error):
+        async def convert():
+            converter = async_convert.Converter(asyncio.get_running_loop())
+            started = threading.Event()
+
+            def work():
+                started.set()
+                converter.cancelled.wait()
+                raise error()
+
+            async def consume():
+                async for _ in converter.iter_events(work):
+                    pass
+
+            task = asyncio.ensure_future(consume())
+            while not started.is_set():
+                await asyncio.sleep(0.01)
+            await asyncio.sleep(0.01)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            return asyncio.all_tasks() - {asyncio.current_task()}
+
+        assert asyncio.run(convert()) == set()
+
+
+class TestAsyncCsvToExcel(object):
+
+    def test_csv_to_excel(self):
+        events = []
+        result = asyncio.run(async_convert.convert_csv_to_excel(
+            io.BytesIO(fix.CSV_FILE_GOOD.encode('utf-8')), title='Tenant',
+            progress=events.append))
+        wb = openpyxl.load_workbook(io.BytesIO(result))
+        assert wb.active.title == 'Tenant'
+        assert wb.active['A2'].value == fix.TITLE_GOOD
+        assert wb.active['Q2'].value == fix.LAST_MODIFIED_BY
+        assert [e.stage for e in events] == ['read', 'rows']
+        assert events[1].count == 2
+
+    def test_bad_header(self):
+        with pytest.raises(bm2xls.ValidationError):
+            asyncio.run(async_convert.convert_csv_to_excel(
+                fix.HEADER_BAD.encode('utf-8')))
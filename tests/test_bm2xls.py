@@ -26,6 +26,7 @@
 # ---------------------------------------------------------------------------
 
 import datetime as dt
+import io
 import locale
 
 import openpyxl
@@ -60,6 +61,67 @@ class TestBm2xlxReadInput(object):
         assert retval[fix.ID_GOOD]['P'] == fix.LAST_MODIFIED
         assert retval[fix.ID_GOOD]['Q'] == fix.LAST_MODIFIED_BY
 
+    def test_read_input_shares_values(self, tmp_path):
+        header, row = fix.CSV_FILE_GOOD.splitlines()[:2]
+        fn = tmp_path / 'shared.csv'
+        fn.write_text('\n'.join([
+            header, row, row.replace(fix.ID_GOOD, fix.ID_GOOD[::-1])]),
+            encoding='utf-8')
+        retval = bm2xls.read_input_file(str(fn))
+        first, second = retval[fix.ID_GOOD], retval[fix.ID_GOOD[::-1]]
+        assert first['E'] == fix.STATE_GOOD
+        assert first['E'] is second['E']
+        assert first['K'] is second['K']
+        assert first['A'] is not second['A']
+
+    def test_iter_csv_rows_shares_values(self):
+        header, row = fix.CSV_FILE_GOOD.splitlines()[:2]
+        rows = list(bm2xls.iter_csv_rows(io.StringIO('\n'.join([
+            header, row, row.replace(fix.ID_GOOD, fix.ID_GOOD[::-1])]))))
+        assert len(rows) == 3
+        assert rows[1][4] == fix.STATE_GOOD
+        assert rows[1][4] is rows[2][4]
+        assert rows[1][10] is rows[2][10]
+        assert rows[1][0] is not rows[2][0]
+
+    def test_iter_input_rows(self, input_filename):
+        rows = list(bm2xls.iter_input_rows(input_filename))
+        assert len(rows) == 2
+        assert rows[0] == tuple(fix.HEADER_GOOD.split(','))
+        assert isinstance(rows[1], tuple)
+        assert rows[1][0] == fix.TITLE_GOOD
+        assert rows[1][-1] == fix.ID_GOOD
+
+    def test_iter_input_rows_bad_header(self, tmp_path):
+        fn = tmp_path / 'bad_header.csv'
+        fn.write_text(fix.HEADER_BAD, encoding='utf-8')
+        with pytest.raises(bm2xls.ValidationError) as e:
+            list(bm2xls.iter_input_rows(str(fn)))
+        assert str(e.value) == 'Header of CSV file not correct'
+
+    def test_iter_unique_ids(self):
+        width = len(fix.HEADER_GOOD.split(','))
+        rows = [['a', fix.ID_GOOD], ['b', ''], ['c', '']]
+        rows = [row[:1] + [''] * (width - 2) + row[1:] for row in rows]
+        assert len(list(bm2xls.iter_unique_ids(iter(rows), width))) == 3
+        rows.append(rows[0])
+        with pytest.raises(bm2xls.ValidationError) as e:
+            list(bm2xls.iter_unique_ids(iter(rows), width))
+        assert str(e.value) == 'The Id \'{}\' exists more than ' \
+            'once'.format(fix.ID_GOOD)
+
+    def test_convert_duplicate_ids(self, tmp_path, monkeypatch, capsys):
+        monkeypatch.chdir(tmp_path)
+        fn = tmp_path / 'duplicates.csv'
+        row = fix.CSV_FILE_GOOD.split('\n')[1]
+        fn.write_text('{}\n{}\n'.format(fix.CSV_FILE_GOOD, row),
+                      encoding='utf-8')
+        with pytest.raises(SystemExit) as e:
+            bm2xls.convert_csv_to_excel('duplicates')
+        assert e.value.code == 1
+        assert capsys.readouterr().out.startswith('The Id')
+        assert not (tmp_path / 'duplicates.xlsx').exists()
+
     def test_validate_header_good(self):
         header_row = fix.HEADER_GOOD.split(',')
         retval = bm2xls.validate_header(header_row)
@@ -92,6 +154,33 @@ class TestBm2xlxWriteXlsx(object):
         assert my_last_modified.strftime('%m/%d/%Y') == fix.LAST_MODIFIED
         assert ws['{}{}'.format('Q', 2)].value == fix.LAST_MODIFIED_BY
 
+    def test_write_workbook(self, tmp_path):
+        output = str(tmp_path / 'written.xlsx')
+        header = fix.HEADER_GOOD.split(',')
+        row = [''] * len(header)
+        row[0] = fix.TITLE_GOOD
+        row[9] = fix.END_DATE
+        row[15] = fix.LAST_MODIFIED
+        row[17] = fix.ID_GOOD
+        locale.setlocale(locale.LC_ALL, '')
+        bm2xls.write_workbook(output, fix.FILENAME, iter([header, row, row]))
+        wb = openpyxl.load_workbook(output)
+        ws = wb.active
+        assert ws.title == fix.FILENAME
+        assert ws.auto_filter.ref == 'A1:R3'
+        assert ws['A1'].value == 'Title'
+        assert ws['A1'].font.bold is True
+        assert ws['A2'].font.bold is False
+        assert ws['A3'].value == fix.TITLE_GOOD
+        assert ws['B2'].value is None
+        assert ws['J2'].value == dt.datetime(2022, 12, 29, 7, 30)
+        assert ws['J2'].number_format == bm2xls.get_date_format_by_str(
+            fix.END_DATE)
+        assert ws['P3'].value == dt.datetime(2022, 12, 28, 0, 0)
+        assert ws['P3'].number_format == bm2xls.get_date_format_by_str(
+            fix.LAST_MODIFIED)
+        assert ws['R2'].value == fix.ID_GOOD
+
 
 class TestBm2xlxDates(object):
 
@@ -141,3 +230,28 @@ class TestBm2xlxFormats(object):
     def test_not_date_format(self):
         my_format = bm2xls.get_date_format_by_str('anything')
         assert my_format == ''
+
+
+class TestBm2xlxStreams(object):
+
+    def test_convert_csv_stream_binary(self):
+        input_file = io.BytesIO(fix.CSV_FILE_GOOD.encode('utf-8'))
+        output = bm2xls.convert_csv_stream(input_file)
+        assert not input_file.closed
+        wb = openpyxl.load_workbook(io.BytesIO(output.getvalue()))
+        assert wb.active.title == 'Bookmarks'
+        assert wb.active['A2'].value == fix.TITLE_GOOD
+        assert wb.active['Q2'].value == fix.LAST_MODIFIED_BY
+
+    def test_convert_csv_stream_text(self):
+        output = io.BytesIO()
+        retval = bm2xls.convert_csv_stream(
+            io.StringIO(fix.CSV_FILE_GOOD, newline=''), output, 'Tenant')
+        assert retval is output
+        wb = openpyxl.load_workbook(output)
+        assert wb.active.title == 'Tenant'
+        assert wb.active['B2'].value == fix.URL_GOOD
+
+    def test_convert_csv_stream_bad_header(self):
+        with pytest.raises(bm2xls.ValidationError):
+            bm2xls.convert_csv_stream(io.StringIO(fix.HEADER_BAD))
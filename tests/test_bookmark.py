@@ -184,7 +184,8 @@ class TestBookmarkHelpers(object):
         assert bm_list[11] == fix.USE_AAD_LOCATION_FALSE_GOOD
         assert bm_list[12] == fix.GROUPS_GOOD
         assert bm_list[13] == fix.DEVICE_AND_OS_GOOD
-        assert bm_list[14] == json.loads(fix.VARIATION_GOOD.replace('""', '"'))
+        assert bm_list[14] == fix.VARIATION_GOOD
+        assert bm.targeted_variations == json.loads(fix.VARIATION_GOOD)
         assert bm_list[15] == last_modified.strftime('%m/%d/%Y')
         assert bm_list[16] == fix.LAST_MODIFIED_BY
         assert bm_list[17] == fix.ID_GOOD
@@ -457,3 +458,406 @@ class TestBookmarkValidation(object):
             )
         assert str(e.value) == 'Start Date/End Date of \'{}' \
             '\' could not be validated'.format(fix.TITLE_GOOD)
+
+
+class TestBookmarkSchema(object):
+
+    def test_schema_covers_all_columns(self):
+        schema = bookmark.Bookmark.get_schema()
+        columns = bookmark.Bookmark.get_columns()
+        assert sorted(spec.column for spec in schema) == list(columns)
+        by_index = sorted(schema, key=lambda spec: spec.index)
+        assert tuple(spec.name for spec in by_index) == \
+            bookmark.Bookmark.get_fields()
+        assert bookmark.Bookmark.get_schema() is schema
+
+    def test_leftmost_error_wins(self):
+        with pytest.raises(bookmark.ValidationError) as e:
+            bookmark.Bookmark(
+                title=fix.TITLE_GOOD,
+                url=fix.URL_BAD,
+                keywords=fix.KEYWORDS_GOOD,
+                state=fix.STATE_BAD,
+                id=fix.ID_BAD
+            )
+        assert str(e.value) == 'URL of \'Test\' could not be validated'
+
+    def test_notice_suppressed_after_earlier_error(self, capsys):
+        with pytest.raises(bookmark.ValidationError):
+            bookmark.Bookmark(
+                title=fix.TITLE_GOOD,
+                url=fix.URL_GOOD,
+                keywords=fix.KEYWORDS_GOOD,
+                state=fix.STATE_BAD,
+                description=fix.DESCRIPTION_BAD
+            )
+        assert capsys.readouterr().out == ''
+
+    def test_context_now_snapshot(self):
+        end_date = dt.datetime.now() + dt.timedelta(days=1)
+        context = bookmark.ValidationContext(
+            now=end_date + dt.timedelta(days=1))
+        with pytest.raises(bookmark.ValidationError) as e:
+            bookmark.Bookmark(
+                title=fix.TITLE_GOOD,
+                url=fix.URL_GOOD,
+                keywords=fix.KEYWORDS_GOOD,
+                end_date=end_date,
+                context=context
+            )
+        assert str(e.value).startswith('Start Date/End Date of')
+
+    def test_context_shared_across_bookmarks(self):
+        context = bookmark.ValidationContext()
+        for title in ['Test1', 'Test2']:
+            bm = bookmark.Bookmark(
+                title=title,
+                url=fix.URL_GOOD,
+                keywords=fix.KEYWORDS_GOOD,
+                groups=fix.GROUPS_GOOD,
+                context=context
+            )
+            assert bm.groups == fix.GROUPS_GOOD.split(';')
+        assert context.caches['groups'] == {fix.GROUPS_GOOD: True}
+
+    def test_context_shares_values(self):
+        context = bookmark.ValidationContext()
+        bms = [bookmark.Bookmark(
+            title=title,
+            url=fix.URL_GOOD,
+            keywords=fix.KEYWORDS_GOOD,
+            # Equal but distinct strings, as read from different rows
+            state=''.join(fix.STATE_GOOD),
+            categories=''.join(fix.CATEGORIES),
+            country_region=''.join(fix.COUNTRY_GOOD),
+            groups=''.join(fix.GROUPS_GOOD),
+            device_and_os=''.join(fix.DEVICE_AND_OS_GOOD),
+            context=context
+        ) for title in ['Test1', 'Test2']]
+        assert bms[0].state is bms[1].state
+        for name in ['categories', 'country_region', 'groups',
+                     'device_and_os']:
+            first, second = getattr(bms[0], name), getattr(bms[1], name)
+            assert first is not second
+            assert all(a is b for a, b in zip(first, second))
+        assert bms[0].country_region == fix.COUNTRY_GOOD.split(';')
+        bms[0].country_region.append('fr')
+        assert bms[1].country_region == fix.COUNTRY_GOOD.split(';')
+        assert bms[1].to_string()[10] == fix.COUNTRY_GOOD
+        other = bookmark.Bookmark(
+            title='Test3',
+            url=fix.URL_GOOD,
+            keywords=fix.KEYWORDS_GOOD,
+            country_region=fix.COUNTRY_GOOD.split(';')[1],
+            context=context
+        )
+        assert other.country_region[0] is bms[0].country_region[1]
+        again = bookmark.Bookmark(
+            title='Test4',
+            url=fix.URL_GOOD,
+            keywords=fix.KEYWORDS_GOOD,
+            country_region=fix.COUNTRY_GOOD,
+            context=context
+        )
+        assert again.country_region == fix.COUNTRY_GOOD.split(';')
+
+    def test_context_cache_size(self):
+        context = bookmark.ValidationContext(cache_size=2)
+        for i in range(5):
+            key = 'k{}'.format(i)
+            assert context.check('groups', key, key, str.upper) == key.upper()
+            assert context.share_values(
+                'country_region', key, [key, 'de']) == [key, 'de']
+        assert list(context.caches['groups']) == ['k3', 'k4']
+        assert list(context.shared['country_region']) == ['k3', 'k4']
+        assert len(context.values) == 2
+        # Recently used entries are kept
+        value = context.intern('k4')
+        assert value is context.values['k4']
+        context.intern('new')
+        assert list(context.values) == ['k4', 'new']
+
+    def test_from_row(self):
+        bm = bookmark.Bookmark.from_row((
+            fix.TITLE_GOOD, fix.URL_GOOD, fix.KEYWORDS_GOOD,
+            fix.MATCH_SIMILAR_KEYWORDS_GOOD, fix.STATE_GOOD))
+        assert bm.title == fix.TITLE_GOOD
+        assert bm.state == fix.STATE_GOOD
+        assert bm.use_aad_location is False
+        assert bm.id is None
+
+
+class TestBookmarkUrlCache(object):
+
+    def test_url_cache_shared_with_variations(self):
+        bookmark.Bookmark.clear_url_cache()
+        for _ in range(2):
+            bookmark.Bookmark(
+                title=fix.TITLE_GOOD,
+                url=fix.URL_GOOD,
+                keywords=fix.KEYWORDS_GOOD,
+                targeted_variations=fix.VARIATION_GOOD
+            )
+        info = bookmark.Bookmark.get_url_cache_info()
+        assert info.misses == 1
+        assert info.hits == 3
+        assert info.maxsize == bookmark.URL_CACHE_SIZE
+
+    def test_url_cache_keeps_results(self):
+        bookmark.Bookmark.clear_url_cache()
+        for _ in range(2):
+            assert bookmark.Bookmark.validate_url(fix.URL_GOOD)
+            assert not bookmark.Bookmark.validate_url(fix.URL_BAD)
+            assert bookmark.Bookmark.validate_url(fix.ALIAS_GOOD)
+            assert not bookmark.Bookmark.validate_url(fix.ALIAS_BAD)
+        assert bookmark.Bookmark.get_url_cache_info().hits == 4
+
+    def test_url_cache_skips_non_strings(self):
+        bookmark.Bookmark.clear_url_cache()
+        with pytest.raises(TypeError):
+            bookmark.Bookmark.validate_url(None)
+        assert bookmark.Bookmark.get_url_cache_info().currsize == 0
+
+
+class TestBookmarkVariations(object):
+
+    def test_variations_keep_raw_string(self):
+        bm = bookmark.Bookmark(
+            title=fix.TITLE_GOOD,
+            url=fix.URL_GOOD,
+            keywords=fix.KEYWORDS_GOOD,
+            targeted_variations=fix.VARIATION_GOOD
+        )
+        assert bm.targeted_variations == json.loads(fix.VARIATION_GOOD)
+        assert bm.targeted_variations.raw is fix.VARIATION_GOOD
+        assert bm.to_string()[14] is fix.VARIATION_GOOD
+
+    def test_variations_validated_once_per_context(self, mocker):
+        spy = mocker.spy(bookmark.Bookmark, 'validate_variations')
+        context = bookmark.ValidationContext()
+        for _ in range(3):
+            bm = bookmark.Bookmark(
+                title=fix.TITLE_GOOD,
+                url=fix.URL_GOOD,
+                keywords=fix.KEYWORDS_GOOD,
+                targeted_variations=fix.VARIATION_GOOD,
+                context=context
+            )
+        assert spy.call_count == 1
+        assert bm.targeted_variations == json.loads(fix.VARIATION_GOOD)
+
+    @pytest.mark.parametrize('backend', [True, False])
+    def test_variations_invalid_json(self, monkeypatch, backend):
+        if not backend:
+            monkeypatch.setattr(bookmark, 'orjson', None)
+        with pytest.raises(json.JSONDecodeError) as e:
+            bookmark.Bookmark(
+                title=fix.TITLE_GOOD,
+                url=fix.URL_GOOD,
+                keywords=fix.KEYWORDS_GOOD,
+                targeted_variations='[{"title": "Test"'
+            )
+        with pytest.raises(json.JSONDecodeError) as reference:
+            json.loads('[{"title": "Test"')
+        assert str(e.value) == str(reference.value)
+
+    def test_variations_without_orjson(self, monkeypatch):
+        monkeypatch.setattr(bookmark, 'orjson', None)
+        assert bookmark.Bookmark.load_variations(fix.VARIATION_GOOD) == \
+            json.loads(fix.VARIATION_GOOD)
+        assert bookmark.Bookmark.validate_targeted_variations(
+            fix.VARIATION_GOOD)
+
+
+class TestBookmarkBatch(object):
+
+    ROWS = [
+        (fix.TITLE_GOOD, fix.URL_GOOD, fix.KEYWORDS_GOOD, None,
+         fix.STATE_GOOD, None, None, None, None, None, fix.COUNTRY_GOOD,
+         None, fix.GROUPS_GOOD, None, None, None, None, fix.ID_GOOD),
+        (fix.TITLE_GOOD, fix.URL_BAD, fix.KEYWORDS_GOOD, None,
+         fix.STATE_BAD, None, None, None, None, None, fix.COUNTRY_BAD),
+        (None, fix.URL_GOOD, fix.KEYWORDS_GOOD, None, fix.STATE_GOOD),
+        (fix.TITLE_GOOD, fix.URL_GOOD, fix.KEYWORDS_GOOD, None,
+         'scheduled', None, None, None, None, None, fix.COUNTRY_GOOD,
+         None, fix.GROUPS_GOOD, None, None, None, None, fix.ID_GOOD),
+        (fix.TITLE_GOOD, fix.URL_GOOD, fix.KEYWORDS_GOOD, None,
+         fix.STATE_GOOD, None, None, None, None, None, None, None, None,
+         None, fix.VARIATION_BAD_4),
+        (fix.TITLE_GOOD, fix.URL_GOOD, fix.KEYWORDS_GOOD, None,
+         fix.STATE_GOOD, None, None, None, None, None, fix.COUNTRY_GOOD,
+         None, fix.GROUPS_GOOD, None, None, None, None, fix.ID_GOOD)
+    ]
+
+    def test_validate_rows_like_constructor(self):
+        mask, errors = bookmark.Bookmark.validate_rows(self.ROWS)
+        expected = []
+        for row in self.ROWS:
+            try:
+                bookmark.Bookmark.from_row(row)
+                expected.append(None)
+            except Exception as e:
+                expected.append(str(e))
+        assert mask == [error is None for error in expected]
+        assert [(row, str(error)) for row, error in errors] == [
+            (row, error) for row, error in enumerate(expected)
+            if error is not None]
+        assert str(errors[0][1]) == 'URL of \'Test\' could not be validated'
+        assert isinstance(errors[1][1], TypeError)
+        assert str(errors[2][1]) == \
+            'State/End Date of \'Test\' could not be validated'
+
+    def test_validate_rows_once_per_value(self, mocker):
+        spy = mocker.spy(bookmark.Bookmark, 'validate_id')
+        mask, errors = bookmark.Bookmark.validate_rows(self.ROWS * 10)
+        assert len(mask) == 60
+        assert len(errors) == 40
+        assert spy.call_count == 2
+
+    def test_validate_columns(self):
+        mask, errors = bookmark.Bookmark.validate_columns({
+            'title': [fix.TITLE_GOOD, fix.TITLE_GOOD],
+            'url': [fix.URL_GOOD, fix.ALIAS_BAD],
+            'keywords': [fix.KEYWORDS_GOOD, fix.KEYWORDS_GOOD]
+        })
+        assert mask == [True, False]
+        assert [row for row, _ in errors] == [1]
+
+    def test_validate_columns_of_different_lengths(self):
+        with pytest.raises(ValueError):
+            bookmark.Bookmark.validate_columns({
+                'title': [fix.TITLE_GOOD, fix.TITLE_GOOD],
+                'url': [fix.URL_GOOD],
+                'keywords': [fix.KEYWORDS_GOOD, fix.KEYWORDS_GOOD]
+            })
+
+    def test_from_rows_like_from_row(self):
+        rows = self.ROWS + [
+            (fix.TITLE_BAD, fix.URL_GOOD, fix.KEYWORDS_GOOD, None,
+             fix.STATE_GOOD, fix.DESCRIPTION_BAD, None, fix.CATEGORIES,
+             None, None, fix.COUNTRY_GOOD, None, None, None,
+             fix.VARIATION_GOOD),
+            (fix.TITLE_BAD, fix.URL_BAD, fix.KEYWORDS_GOOD, None,
+             fix.STATE_GOOD, fix.DESCRIPTION_BAD)]
+        results = bookmark.Bookmark.from_rows(rows)
+        assert len(results) == len(rows)
+        for row, (bm, notices, error) in zip(rows, results):
+            context = bookmark.ValidationContext(notices=[])
+            try:
+                expected = bookmark.Bookmark.from_row(row, context)
+            except Exception as e:
+                assert bm is None
+                assert type(error) is type(e)
+                assert str(error) == str(e)
+            else:
+                assert error is None
+                assert bm.to_string() == expected.to_string()
+            assert notices == context.notices
+        assert results[-2][1][0].startswith('Title has been shortened')
+        assert results[-1][1] == results[-2][1][:1]
+
+    def test_from_rows_copies_values(self):
+        row = (fix.TITLE_GOOD, fix.URL_GOOD, fix.KEYWORDS_GOOD, None,
+               fix.STATE_GOOD, None, None, None, None, None,
+               fix.COUNTRY_GOOD, None, None, None, fix.VARIATION_GOOD)
+        bms = [bm for bm, _, _ in bookmark.Bookmark.from_rows([row] * 2)]
+        assert bms[0].country_region is not bms[1].country_region
+        assert bms[0].keywords is not bms[1].keywords
+        bms[0].targeted_variations[0]['Url'] = fix.URL_BAD
+        assert bms[1].targeted_variations == json.loads(fix.VARIATION_GOOD)
+
+
+class TestBookmarkRecord(object):
+
+    def get_bookmark(self, title):
+        return bookmark.Bookmark(
+            title=title,
+            url=fix.URL_GOOD,
+            keywords=fix.KEYWORDS_GOOD,
+            state=fix.STATE_GOOD,
+            categories=fix.CATEGORIES,
+            country_region=fix.COUNTRY_GOOD,
+            groups=fix.GROUPS_GOOD,
+            device_and_os=fix.DEVICE_AND_OS_GOOD,
+            targeted_variations=fix.VARIATION_GOOD,
+            id=fix.ID_GOOD
+        )
+
+    def test_bookmark_slots(self):
+        bm = self.get_bookmark(fix.TITLE_GOOD)
+        assert bookmark.Bookmark.__slots__ == bookmark.Bookmark.get_fields()
+        assert not hasattr(bm, '__dict__')
+
+    def test_record_to_string(self):
+        bm = self.get_bookmark(fix.TITLE_GOOD)
+        record = bookmark.BookmarkRecord.from_bookmark(bm)
+        assert not hasattr(record, '__dict__')
+        assert record.to_string() == bm.to_string()
+        assert record.keywords == tuple(bm.keywords)
+        assert record.targeted_variations == bm.targeted_variations
+
+    def test_record_interns_values(self):
+        records = [
+            bookmark.BookmarkRecord.from_bookmark(self.get_bookmark(title))
+            for title in ['Test 1', 'Test 2']]
+        assert records[0].groups[0] is records[1].groups[0]
+        assert records[0].country_region[1] is records[1].country_region[1]
+
+
+class TestLazyBookmark(object):
+
+    ROW = (
+        fix.TITLE_GOOD, fix.URL_GOOD, fix.KEYWORDS_GOOD, None,
+        fix.STATE_GOOD, None, None, None, None, None, fix.COUNTRY_GOOD,
+        None, fix.GROUPS_GOOD, None, fix.VARIATION_GOOD)
+
+    def test_fields_parsed_on_access(self, mocker):
+        spies = [mocker.spy(bookmark.Bookmark, name) for name in [
+            'check_url', 'validate_groups', 'load_variations']]
+        bm = bookmark.LazyBookmark(self.ROW)
+        assert bm.title == fix.TITLE_GOOD
+        assert bm.keywords == fix.KEYWORDS_GOOD.split(';')
+        assert all(spy.call_count == 0 for spy in spies)
+        assert bm.groups == fix.GROUPS_GOOD.split(';')
+        assert bm.groups == fix.GROUPS_GOOD.split(';')
+        assert spies[1].call_count == 1
+        assert not bm.is_validated()
+
+    def test_validate_all_like_constructor(self):
+        bm = bookmark.LazyBookmark(self.ROW).validate_all()
+        assert bm.is_validated()
+        assert bm.match_similar_keywords is True
+        assert bm.id is None
+        assert bm.to_string() == \
+            bookmark.Bookmark.from_row(self.ROW).to_string()
+
+    def test_invalid_field(self):
+        row = (fix.TITLE_GOOD, fix.URL_BAD) + self.ROW[2:]
+        bm = bookmark.LazyBookmark(row)
+        assert bm.keywords == fix.KEYWORDS_GOOD.split(';')
+        with pytest.raises(bookmark.ValidationError) as e:
+            bm.url
+        assert str(e.value) == \
+            'URL of \'{}\' could not be validated'.format(fix.TITLE_GOOD)
+        with pytest.raises(bookmark.ValidationError):
+            bm.to_string()
+        with pytest.raises(AttributeError):
+            bm.unknown
+
+    def test_cross_fields_on_validate_all(self):
+        row = self.ROW[:4] + ('scheduled',)
+        bm = bookmark.LazyBookmark(row)
+        assert bm.state == 'scheduled'
+        with pytest.raises(bookmark.ValidationError) as e:
+            bm.validate_all()
+        assert str(e.value).startswith('State/End Date of')
+
+    def test_record_validates_all(self):
+        bm = bookmark.LazyBookmark(self.ROW)
+        record = bookmark.BookmarkRecord.from_bookmark(bm)
+        assert bm.is_validated()
+        assert record.to_string() == bm.to_string()
+        row = self.ROW[:4] + ('scheduled',)
+        with pytest.raises(bookmark.ValidationError) as e:
+            bookmark.BookmarkRecord.from_bookmark(bookmark.LazyBookmark(row))
+        assert str(e.value).startswith('State/End Date of')
@@ -29,6 +29,7 @@ from unittest.mock import patch
 
 import pytest
 
+import src.ebm.bookmark
 import src.ebm.bookmark_shelf
 
 
@@ -77,6 +78,20 @@ class TestBookmarkShelfAdd(object):
         assert str(e.value) == 'The keyword \'test\' exists ' \
             'as reserved keyword'
 
+    @patch('src.ebm.bookmark.Bookmark')
+    def test_add_bookmark_without_keeping_it(self, MockBookmark):
+        bm_shelf = src.ebm.bookmark_shelf.BookmarkShelf(keep_bookmarks=False)
+        bm = MockBookmark
+        bm.title = 'Test'
+        bm.state = 'published'
+        bm.keywords = ['test']
+        bm_shelf.add_bookmark(bm)
+        assert bm_shelf.get_bookmarks() == {}
+        with pytest.raises(Exception) as e:
+            bm_shelf.add_bookmark(bm)
+        assert str(e.value).startswith(
+            'A bookmark with the title \'Test\'')
+
     def test_add_reserved_keywords(self):
         bm_shelf = src.ebm.bookmark_shelf.BookmarkShelf()
         bm_shelf.add_reserved_keywords(['test'])
@@ -89,6 +104,68 @@ class TestBookmarkShelfAdd(object):
             bm_shelf.add_reserved_keywords(['test'])
         assert str(e.value) == 'The reserved keyword \'test\' exists already'
 
+    def test_add_bookmarks_with_shared_keyword(self, mocker):
+        bm_shelf = src.ebm.bookmark_shelf.BookmarkShelf()
+        bm1 = mocker.MagicMock(title='Test1', state='draft',
+                               keywords=['test', 'one'],
+                               reserved_keywords=[])
+        bm2 = mocker.MagicMock(title='Test2', state='draft',
+                               keywords=['test', 'two'],
+                               reserved_keywords=[])
+        bm_shelf.add_bookmark(bm1)
+        bm_shelf.add_bookmark(bm2)
+        assert bm_shelf.keywords == ['test', 'one', 'two']
+        assert bm_shelf.get_bookmarks_by_keyword('test') == [bm1, bm2]
+        assert bm_shelf.get_bookmarks_by_keyword('two') == [bm2]
+        assert bm_shelf.get_bookmarks_by_keyword('three') == []
+
+    def test_add_reserved_keyword_of_previous_bookmark(self, mocker):
+        bm_shelf = src.ebm.bookmark_shelf.BookmarkShelf()
+        bm1 = mocker.MagicMock(title='Test1', state='draft',
+                               keywords=['test'], reserved_keywords=[])
+        bm2 = mocker.MagicMock(title='Test2', state='draft',
+                               keywords=[], reserved_keywords=['test'])
+        bm_shelf.add_bookmark(bm1)
+        with pytest.raises(Exception) as e:
+            bm_shelf.add_bookmark(bm2)
+        assert str(e.value) == 'The reserved keyword \'test\' exists ' \
+            'in other keywords'
+
+    def test_keyword_index_without_keeping_bookmarks(self, mocker):
+        bm_shelf = src.ebm.bookmark_shelf.BookmarkShelf(
+            keep_bookmarks=False)
+        bm = mocker.MagicMock(title='Test', state='draft',
+                              keywords=['test'], reserved_keywords=['res'])
+        bm_shelf.add_bookmark(bm)
+        assert bm_shelf.keywords == ['test']
+        assert bm_shelf.reserved_keywords == ['res']
+        assert bm_shelf.get_bookmarks_by_keyword('test') == []
+
+    def test_no_keys_without_keeping_bookmarks(self, mocker):
+        uuid4 = mocker.spy(src.ebm.bookmark_shelf.uuid, 'uuid4')
+        bm_shelf = src.ebm.bookmark_shelf.BookmarkShelf(
+            keep_bookmarks=False)
+        for title in ['Test1', 'Test2']:
+            bm_shelf.add_bookmark(mocker.MagicMock(
+                title=title, state='draft', keywords=['test'],
+                reserved_keywords=[title]))
+        assert uuid4.call_count == 0
+        assert bm_shelf.keyword_index == {'test': None}
+        assert bm_shelf.reserved_keyword_index == {
+            'Test1': None, 'Test2': None}
+
+    def test_add_bookmark_to_compact_shelf(self):
+        bm_shelf = src.ebm.bookmark_shelf.BookmarkShelf(compact=True)
+        bm = src.ebm.bookmark.Bookmark(
+            title='Test', url='http://test-rr.de', keywords='test;Test2',
+            state='published')
+        bm_shelf.add_bookmark(bm)
+        records = list(bm_shelf.get_bookmarks().values())
+        assert isinstance(records[0], src.ebm.bookmark.BookmarkRecord)
+        assert records[0].keywords == ('test', 'test2')
+        assert records[0].to_string() == bm.to_string()
+        assert bm_shelf.get_bookmarks_by_keyword('test2') == records
+
 
 class TestBookmarkShelfValidate(object):
 
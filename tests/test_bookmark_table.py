@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# The MIT License (MIT)
+#
+# Copyright (c) 2025, Roland Rickborn (r_2@gmx.net)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+# ---------------------------------------------------------------------------
+
+import base64
+import datetime as dt
+
+import openpyxl
+import pytest
+
+import src.ebm.bookmark as bookmark
+import src.ebm.bookmark_table as bookmark_table
+import src.ebm.xls2bm as xls2bm
+import tests.ebm_fixtures as fix
+
+
+@pytest.fixture
+def bookmarks():
+    start_date = dt.datetime.now() + dt.timedelta(days=10)
+    values = [
+        ('published', 'de;us', 'mobile-ios;pc-mac', None),
+        ('published', 'de', 'pc-windows', start_date),
+        ('draft', 'de', 'mobile-ios', None),
+        ('published', None, 'mobile-ios', None),
+        ('scheduled', 'fr;de', 'mobile-ios',
+         start_date + dt.timedelta(days=5)),
+        ('published', 'de;it', None, start_date + dt.timedelta(days=20))
+    ]
+    return [
+        bookmark.Bookmark(
+            title='Test {}'.format(i),
+            url=fix.URL_GOOD,
+            keywords='test-{};{}'.format(i, fix.KEYWORDS_GOOD),
+            state=state,
+            country_region=country,
+            device_and_os=device,
+            start_date=start,
+            groups=fix.GROUPS_GOOD,
+            targeted_variations=fix.VARIATION_GOOD if i % 2 else None
+        ) for i, (state, country, device, start) in enumerate(values)]
+
+
+@pytest.fixture
+def table(bookmarks):
+    return bookmark_table.BookmarkTable.from_bookmarks(bookmarks)
+
+
+class TestBookmarkTableSelect(object):
+
+    def test_count(self, table):
+        assert len(table) == 6
+        assert table.count(
+            state='published', country='de', device='mobile-ios') == 1
+        assert table.count(state='published') == 4
+        assert table.count(country=['fr', 'it']) == 2
+        assert table.count(device='mobile-ios') == 4
+        assert table.count() == 6
+
+    def test_select_rows(self, table):
+        mask = table.where_state('published') & table.where_country('de')
+        assert list(table.iter_rows(mask)) == [0, 1, 5]
+        assert list(table.iter_rows(table.where_device('pc-linux'))) == []
+
+    def test_where_date(self, table, bookmarks):
+        start = bookmarks[1].start_date
+        mask = table.where_date('start_date', start,
+                                start + dt.timedelta(days=10))
+        assert list(table.iter_rows(mask)) == [1, 4]
+        assert table.count(start=start + dt.timedelta(days=1)) == 2
+        assert table.count(table.where_date('start_date')) == 3
+
+    def test_append_after_select(self, table, bookmarks):
+        assert table.count(state='draft') == 1
+        table.append(bookmarks[2])
+        assert table.count(state='draft') == 2
+        assert list(table.iter_rows(table.where_state('draft'))) == [2, 6]
+
+
+class TestBookmarkTableWrite(object):
+
+    def test_output_rows(self, table, bookmarks):
+        assert [list(row) for row in table.iter_output_rows()] == [
+            xls2bm.get_output_row(bm.to_string()) for bm in bookmarks]
+        assert table.get_record(4).to_string() == bookmarks[4].to_string()
+
+    def test_write_csv(self, table, bookmarks, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        mask = table.where_state('published')
+        filenames = table.write_csv('bookmarks', mask)
+        assert filenames == ['bookmarks.csv']
+        with open(filenames[0], encoding='utf-8') as f:
+            lines = f.read().splitlines()
+        assert len(lines) == 5
+        assert lines[0].startswith('\ufeffTitle,Url,Keywords')
+        assert lines[1].startswith('Test 0,')
+
+    def test_write_xlsx(self, table, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        mask = table.where_country('de')
+        assert table.write_xlsx('bookmarks', mask) == 'bookmarks.xlsx'
+        assert table.write_xlsx('bookmarks', mask) == 'bookmarks_(1).xlsx'
+        wb = openpyxl.load_workbook('bookmarks_(1).xlsx')
+        rows = list(wb.active.values)
+        assert rows[0] == tuple(bookmark.Bookmark.get_columns().values())
+        assert [row[0] for row in rows[1:]] == [
+            'Test 0', 'Test 1', 'Test 2', 'Test 4', 'Test 5']
+        assert isinstance(rows[2][8], dt.datetime)
+
+
+class TestBookmarkTableRead(object):
+
+    def test_from_excel(self, tmp_path):
+        filename = tmp_path / fix.FILENAME
+        with open('{}.xlsx'.format(filename), 'wb') as f:
+            f.write(base64.b64decode(b''.join(fix.TEST_XLSX_FILE_BIG)))
+        table = bookmark_table.BookmarkTable.from_excel(str(filename))
+        assert len(table) == 5072
+        assert table.get_record(5071).title == 'Test 5072'
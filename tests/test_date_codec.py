@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# The MIT License (MIT)
+#
+# Copyright (c) 2025, Roland Rickborn (r_2@gmx.net)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+# ---------------------------------------------------------------------------
+
+import datetime as dt
+import random
+
+import pytest
+
+import src.ebm.date_codec as date_codec
+import tests.ebm_fixtures as fix
+
+
+def reference_parse(datetimestr: str):
+    if 'T' in datetimestr and '+' in datetimestr:
+        try:
+            d = dt.datetime.strptime(datetimestr+'00', '%Y-%m-%dT%H:%M:%S%z')
+            return d.replace(tzinfo=None)
+        except Exception:
+            return datetimestr
+    try:
+        return dt.datetime.strptime(datetimestr, '%m/%d/%Y')
+    except Exception:
+        return datetimestr
+
+
+def date_corpus(size: int):
+    rnd = random.Random(42)
+    alphabet = '0123456789/-T:+ x٣'
+    corpus = [fix.START_DATE, fix.END_DATE, fix.LAST_MODIFIED,
+              fix.LAST_MODIFIED_BAD_2, '', '1/2/2022', '02/30/2022']
+    for _ in range(size):
+        d = dt.datetime(2000, 1, 1) + dt.timedelta(
+            seconds=rnd.randrange(0, 40 * 365 * 86400))
+        value = rnd.choice([
+            d.strftime('%Y-%m-%dT%H:%M:%S+00'),
+            d.strftime('%Y-%m-%dT%H:%M:%S+01'),
+            d.strftime('%m/%d/%Y')])
+        if rnd.random() < 0.5:
+            position = rnd.randrange(len(value))
+            value = value[:position] + rnd.choice(alphabet) + \
+                value[position + 1:]
+        corpus.append(value)
+    return corpus
+
+
+class TestDateCodecParse(object):
+
+    def test_parse_matches_strptime(self):
+        mismatches = [
+            value for value in date_corpus(5000)
+            if date_codec.parse(value) != reference_parse(value)]
+        assert mismatches == []
+
+    def test_parse_timestamp(self):
+        assert date_codec.parse(fix.END_DATE) == dt.datetime(
+            2022, 12, 29, 7, 30)
+
+
+class TestDateCodecFormat(object):
+
+    def test_format_timestamp(self):
+        value = dt.datetime(2022, 1, 2, 3, 4, 5, tzinfo=dt.UTC)
+        assert date_codec.format_timestamp(value) == value.strftime(
+            date_codec.TIMESTAMP_FORMAT)
+
+    def test_format_date(self):
+        value = dt.datetime(2022, 12, 28)
+        assert date_codec.format_date(value) == fix.LAST_MODIFIED
+
+    def test_format_equal_values_in_other_zones(self):
+        values = [
+            dt.datetime(2030, 1, 1, 12, tzinfo=dt.UTC),
+            dt.datetime(2030, 1, 1, 13, tzinfo=dt.timezone(
+                dt.timedelta(hours=1))),
+            dt.datetime(2030, 1, 1, 0, tzinfo=dt.timezone(
+                dt.timedelta(hours=-12)))]
+        assert values[0] == values[1] == values[2]
+        for value in values:
+            assert date_codec.format_timestamp(value) == value.strftime(
+                date_codec.TIMESTAMP_FORMAT)
+            assert date_codec.format_date(value) == value.strftime(
+                date_codec.DATE_FORMAT)
+
+    def test_format_years_below_1000(self):
+        value = dt.datetime(999, 1, 2, 3, 4, 5)
+        assert date_codec.format_timestamp(value) == value.strftime(
+            date_codec.TIMESTAMP_FORMAT)
+        assert date_codec.format_date(value) == value.strftime(
+            date_codec.DATE_FORMAT)
+
+    @pytest.mark.parametrize('loc, value, number_format', [
+        (('de_DE', 'UTF-8'), fix.END_DATE, 'dd.mm.yyyy HH:MM:SS'),
+        (('de_AT', 'UTF-8'), fix.LAST_MODIFIED, 'dd.mm.yyyy'),
+        (('en_US', 'UTF-8'), fix.END_DATE, 'mm/dd/yyyy HH:MM:SS'),
+        (('en_GB', 'UTF-8'), fix.LAST_MODIFIED, 'mm/dd/yyyy'),
+        ((None, None), fix.LAST_MODIFIED, 'mm/dd/yyyy'),
+        (('de_DE', 'UTF-8'), 'anything', '')
+        ])
+    def test_number_format(self, loc, value, number_format):
+        number_formats = date_codec.get_number_formats(loc)
+        assert date_codec.get_number_format(
+            value, number_formats) == number_format
@@ -27,6 +27,9 @@
 
 import base64
 import os
+import runpy
+import subprocess
+import sys
 
 import pytest
 import pathlib
@@ -138,6 +141,31 @@ class TestEbmMain(object):
         assert output.startswith('Output file: sample1.xlsx')
         os.remove('sample1.xlsx')
 
+    def test_main_freeze_support(self, mocker, monkeypatch):
+        freeze_support = mocker.patch('multiprocessing.freeze_support')
+        monkeypatch.setattr(sys, 'argv', ['ebm', '--version'])
+        with pytest.raises(SystemExit):
+            runpy.run_path(ebm.__file__, run_name='__main__')
+        freeze_support.assert_called_once_with()
+
+    def test_main_jobs(self, mocker, capsys):
+        convert = mocker.patch.object(
+            ebm, 'convert_excel_to_csv', return_value='sample.csv')
+        ebm.main(['-i', 'sample.xlsx', '--jobs', '4', '--executor', 'thread'])
+        convert.assert_called_once_with(
+            'sample', streaming=False, jobs=4, executor='thread',
+            pipelined=False)
+        assert capsys.readouterr().out == 'Output file: sample.csv\n'
+
+    def test_main_pipeline(self, mocker, capsys):
+        convert = mocker.patch(
+            'src.ebm.xls2bm.convert_excel_to_csv', return_value='sample.csv')
+        ebm.main(['-i', 'sample.xlsx', '--pipeline'])
+        assert convert.call_args.kwargs['my_pipeline'] is not None
+        output = capsys.readouterr().out
+        assert output.startswith('Stage ')
+        assert output.endswith('Output file: sample.csv\n')
+
     @pytest.mark.skip()  # TODO Need to fix this test
     def test_main_no_argument_with_xlsx_1(
             self, monkeypatch, capsys, excel_file):
@@ -196,3 +224,31 @@ class TestEbmMain(object):
             pass
         output = capsys.readouterr().out
         assert str(output).startswith('[Errno 2] No such file or directory')
+
+
+class TestEbmImports(object):
+
+    HEAVY_MODULES = ['openpyxl', 'validators', 'pycountry']
+
+    def get_imported_modules(self, arg):
+        script = '\n'.join([
+            'import sys',
+            'import src.ebm.enterprise_bookmarks_manager as ebm',
+            'try:',
+            '    ebm.main([{!r}])'.format(arg),
+            'except SystemExit:',
+            '    pass',
+            'print(\'\\n\'.join(sys.modules), file=sys.stderr)'])
+        result = subprocess.run(
+            [sys.executable, '-c', script], capture_output=True, text=True,
+            cwd=pathlib.Path(__file__).parent.parent)
+        return set(result.stderr.split())
+
+    @pytest.mark.parametrize('arg', [
+        ('-c'), ('-s'), ('-d'), ('-v'), ('-l'), ('--version'), ('--help')
+        ])
+    def test_main_info_without_heavy_imports(self, arg):
+        modules = self.get_imported_modules(arg)
+        assert 'src.ebm.enterprise_bookmarks_manager' in modules
+        for module in self.HEAVY_MODULES:
+            assert module not in modules
@@ -25,6 +25,8 @@
 #
 # ---------------------------------------------------------------------------
 
+import pytest
+
 import src.ebm.enums as enums
 
 
@@ -35,3 +37,34 @@ class TestEnums(object):
         test = ['de', 'us', 'ar']
         result = set(countries) & set(test)
         assert list(result).sort() == test.sort()
+
+    def test_enums_countries_built_once(self):
+        assert enums.get_countries() is enums.get_countries()
+        assert enums.Enums().countries is enums.Enums().countries
+
+    def test_enums_tables_are_immutable(self):
+        with pytest.raises(TypeError):
+            enums.get_countries()['xx'] = 'Nowhere'
+        with pytest.raises(TypeError):
+            enums.DEVICES['pc-linux'] = 'PC - Linux'
+        assert 'de' in enums.get_country_codes()
+        assert 'published' in enums.STATUS_CODES
+        assert 'mobile-ios' in enums.DEVICE_CODES
+        assert 'country' in enums.VARIATION_KEYS
+
+    def test_enums_countries_match_pycountry(self):
+        pycountry = pytest.importorskip('pycountry')
+        import importlib.metadata
+        import src.ebm.country_codes as country_codes
+        if importlib.metadata.version('pycountry') != \
+                country_codes.PYCOUNTRY_VERSION:
+            pytest.skip('Country table was generated from another pycountry')
+        assert len(enums.get_countries()) == len(pycountry.countries)
+        assert enums.get_countries() == enums.get_countries(
+            use_pycountry=True)
+        assert list(enums.get_countries()) == list(
+            enums.get_countries(use_pycountry=True))
+
+    def test_enums_countries_without_pycountry(self):
+        assert enums.get_countries()['de'] == 'Germany'
+        assert enums.get_country_codes() is enums.get_country_codes()
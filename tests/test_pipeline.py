@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# The MIT License (MIT)
+#
+# Copyright (c) 2025, Roland Rickborn (r_2@gmx.net)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+# ---------------------------------------------------------------------------
+
+import threading
+
+import pytest
+
+import src.ebm.pipeline as pipeline
+
+
+class TestBoundedQueue(object):
+
+    def test_backpressure(self):
+        my_pipeline = pipeline.Pipeline(queue_size=2)
+        my_queue = my_pipeline.add_queue('items')
+        producer = my_pipeline.add_stage('producer')
+        for item in range(2):
+            my_queue.put(item, producer)
+        blocked = threading.Thread(target=my_queue.put, args=(2, producer))
+        blocked.start()
+        blocked.join(0.3)
+        assert blocked.is_alive()
+        consumer = my_pipeline.add_stage('consumer')
+        assert my_queue.get(consumer) == 0
+        blocked.join()
+        assert my_queue.max_depth == 2
+        assert producer.waiting > 0.2
+
+    def test_stopped(self):
+        my_pipeline = pipeline.Pipeline(queue_size=1)
+        my_queue = my_pipeline.add_queue('items')
+        counters = my_pipeline.add_stage('consumer')
+        my_pipeline.stopped.set()
+        with pytest.raises(pipeline.PipelineStopped):
+            my_queue.get(counters)
+        with pytest.raises(pipeline.PipelineStopped):
+            my_queue.put(1, counters)
+
+
+class TestPipeline(object):
+
+    def run_pipeline(self, produce, consume, size=100):
+        my_pipeline = pipeline.Pipeline(queue_size=4)
+        my_queue = my_pipeline.add_queue('items')
+        producer = my_pipeline.add_stage('producer')
+        consumer = my_pipeline.add_stage('consumer')
+        retval = []
+
+        def run_consumer():
+            for item in my_queue.iter_items(consumer):
+                consumer.items += 1
+                retval.append(consume(item))
+
+        def run_producer():
+            for item in range(size):
+                producer.items += 1
+                my_queue.put(produce(item), producer)
+            my_queue.close(producer)
+
+        my_pipeline.start_thread(consumer, run_consumer)
+        my_pipeline.run(producer, run_producer)
+        return my_pipeline, retval
+
+    def test_items_in_order(self):
+        my_pipeline, retval = self.run_pipeline(str, int)
+        assert retval == list(range(100))
+        assert [s.items for s in my_pipeline.stages] == [100, 100]
+        report = my_pipeline.get_report().splitlines()
+        assert report[0].split() == [
+            'Stage', 'Items', 'Busy', 's', 'Waiting', 's', 'Items/s']
+        assert report[1].split()[:2] == ['producer', '100']
+        assert report[3].split() == ['Queue', 'Size', 'Max', 'Mean']
+        assert report[4].split()[:2] == ['items', '4']
+
+    def test_error_in_thread(self):
+        def consume(item):
+            if item == 50:
+                raise ValueError('Broken item')
+            return item
+
+        with pytest.raises(ValueError) as e:
+            self.run_pipeline(int, consume, size=1000)
+        assert str(e.value) == 'Broken item'
+
+    def test_error_in_calling_thread(self):
+        def produce(item):
+            if item == 50:
+                raise ValueError('Broken item')
+            return item
+
+        with pytest.raises(ValueError) as e:
+            self.run_pipeline(produce, int)
+        assert str(e.value) == 'Broken item'
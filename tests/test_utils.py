@@ -81,3 +81,13 @@ class TestMostPossibleFile(object):
         assert most_possible_file == 'test3.csv'
         for filename in to_be_deleted:
             os.remove(filename)
+
+
+class TestGil(object):
+
+    def test_is_gil_enabled(self, monkeypatch):
+        monkeypatch.setattr(utils.sys, '_is_gil_enabled', lambda: False,
+                            raising=False)
+        assert utils.is_gil_enabled() is False
+        monkeypatch.delattr(utils.sys, '_is_gil_enabled')
+        assert utils.is_gil_enabled() is True
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# The MIT License (MIT)
+#
+# Copyright (c) 2025, Roland Rickborn (r_2@gmx.net)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+#
+# ---------------------------------------------------------------------------
+
+import random
+import uuid
+
+import validators
+
+import src.ebm.validation as validation
+import tests.ebm_fixtures as fix
+
+
+def url_corpus(size: int):
+    rnd = random.Random(42)
+    labels = ['a', 'ab', 'host-1', 'x' * 63, 'x' * 64, '-a', 'a-', '1', 'de',
+              'com', 'c0m', 'ex_ample', 'ü', 'xn--ab', 'K', '']
+    alphabet = ['/', '.', '-', '_', '@', '?', '#', '=', '&', '%', '%20',
+                '[', ']', ':', '~', '!', '$', '\'', '(', '*', '+', ',', ';',
+                'a', 'Z', '0', 'é', ' ', '\n', 'ſ']
+    corpus = [fix.URL_GOOD, fix.URL_BAD, fix.ALIAS_GOOD, fix.ALIAS_BAD, '',
+              'http://1.2.3.4', 'http://[::1]:80/', 'http://a.de\n']
+    for _ in range(size):
+        value = rnd.choice(['http://', 'https://', 'HTTPS://', 'ftp://',
+                            'http:/', 'http:///'])
+        value += '.'.join(
+            rnd.choice(labels) for _ in range(rnd.randint(1, 4)))
+        if rnd.random() < 0.3:
+            value += ':' + rnd.choice(
+                ['80', '0', '65535', '65536', '08080', 'abc', ''])
+        if rnd.random() < 0.6:
+            value += '/' + ''.join(
+                rnd.choice(alphabet) for _ in range(rnd.randint(0, 5)))
+        corpus.append(value)
+    return corpus
+
+
+def uuid_corpus(size: int):
+    rnd = random.Random(42)
+    corpus = [fix.ID_GOOD, fix.ID_BAD, fix.GROUPS_BAD, '']
+    for _ in range(size):
+        value = str(uuid.UUID(int=rnd.getrandbits(128)))
+        mutation = rnd.random()
+        if mutation < 0.3:
+            value = value.upper()
+        elif mutation < 0.5:
+            value = value.replace('-', '', rnd.randint(0, 4))
+        elif mutation < 0.6:
+            value = '{' + value + '}'
+        elif mutation < 0.7:
+            position = rnd.randint(0, 36)
+            value = value[:position] + rnd.choice('g-_ {}\nK') + \
+                value[position:]
+        corpus.append(value)
+    return corpus
+
+
+class TestValidationConformance(object):
+
+    def test_url_matches_validators(self):
+        mismatches = [
+            value for value in url_corpus(5000)
+            if validation.validate_url(value) != bool(validators.url(value))]
+        assert mismatches == []
+
+    def test_uuid_matches_validators(self):
+        mismatches = [
+            value for value in uuid_corpus(5000)
+            if validation.validate_uuid(value) != bool(
+                validators.uuid(value))]
+        assert mismatches == []
+
+
+class TestValidation(object):
+
+    def test_alias_url(self):
+        assert validation.validate_alias_url(fix.ALIAS_GOOD)
+        assert not validation.validate_alias_url(fix.ALIAS_BAD)
+        assert not validation.validate_alias_url(fix.URL_GOOD)
+
+    def test_validate_urls(self):
+        assert validation.validate_urls(
+            [fix.URL_GOOD, fix.URL_BAD, fix.URL_GOOD, None]) == \
+            [True, False, True, False]
+
+    def test_validate_uuids(self):
+        assert validation.validate_uuids(
+            fix.GROUPS_GOOD.split(';') + [fix.ID_BAD]) == \
+            [True, True, False]
@@ -25,8 +25,15 @@
 #
 # ---------------------------------------------------------------------------
 
+import base64
+import io
+import os
+
 import pytest
 
+import src.ebm.bookmark as bookmark
+import src.ebm.bookmark_shelf as bookmark_shelf
+import src.ebm.pipeline as pipeline
 import src.ebm.xls2bm as xls2bm
 import tests.ebm_fixtures as fix
 
@@ -39,6 +46,75 @@ def output_filename(tmpdir_factory):
     return str(fn)
 
 
+@pytest.fixture(scope='session')
+def input_filename_big(tmpdir_factory):
+    fn = tmpdir_factory.mktemp('data').join('{}.xlsx'.format(fix.FILENAME))
+    with open(fn, 'wb') as f:
+        f.write(base64.b64decode(b''.join(fix.TEST_XLSX_FILE_BIG)))
+    return str(fn)
+
+
+class TestXlsx2bmReadInput(object):
+
+    def test_iter_input_rows(self, input_filename_big):
+        rows = list(xls2bm.iter_input_rows(input_filename_big))
+        width = len(bookmark.Bookmark.get_columns())
+        assert len(rows) == 5072
+        assert all(isinstance(row, tuple) for row in rows)
+        assert all(len(row) == width for row in rows)
+        assert rows[0][:3] == ('Test 1', 'http://test-rr-1.de', 'test-1')
+
+    def test_read_input_file(self, input_filename_big):
+        filename = input_filename_big.split('.xlsx')[0]
+        shelf = xls2bm.read_input_file(filename)
+        bms = list(shelf.get_bookmarks().values())
+        assert len(bms) == 5072
+        assert bms[-1].title == 'Test 5072'
+        assert bms[-1].keywords == ['test-5072']
+
+    def test_read_input_file_lazy(self, input_filename_big, mocker):
+        filename = input_filename_big.split('.xlsx')[0]
+        bookmark.Bookmark.clear_url_cache()
+        spy = mocker.spy(bookmark.Bookmark, 'check_url')
+        shelf = xls2bm.read_input_file(filename, lazy=True)
+        bms = list(shelf.get_bookmarks().values())
+        assert len(bms) == 5072
+        assert isinstance(bms[-1], bookmark.LazyBookmark)
+        assert bms[-1].keywords == ['test-5072']
+        assert spy.call_count == 0
+        assert bms[-1].validate_all().url == 'http://test-rr-5072.de'
+        assert spy.call_count == 1
+
+    def test_read_input_file_validates_chunks(self, input_filename_big,
+                                              mocker):
+        spy = mocker.spy(bookmark.Bookmark, 'from_rows')
+        filename = input_filename_big.split('.xlsx')[0]
+        shelf = xls2bm.read_input_file(filename)
+        assert len(shelf.get_bookmarks()) == 5072
+        assert spy.call_count == 11
+
+    def test_read_input_file_compact_lazy(self, tmp_path, capsys,
+                                          write_workbook):
+        filename = str(tmp_path / 'scheduled')
+        write_workbook('{}.xlsx'.format(filename), [
+            ('Test 1', fix.URL_GOOD, 'test-1', None, 'scheduled')])
+        with pytest.raises(SystemExit) as e:
+            xls2bm.read_input_file(filename, compact=True, lazy=True)
+        assert e.value.code == 1
+        assert capsys.readouterr().out.startswith('State/End Date of')
+
+    @pytest.mark.parametrize('keep_bookmarks, cache_size', [
+        (True, None), (False, xls2bm.CACHE_SIZE)])
+    def test_admitted_bookmarks_cache_size(self, input_filename_big, mocker,
+                                           keep_bookmarks, cache_size):
+        spy = mocker.spy(bookmark, 'ValidationContext')
+        shelf = bookmark_shelf.BookmarkShelf(keep_bookmarks=keep_bookmarks)
+        bms = xls2bm.iter_admitted_bookmarks(
+            xls2bm.iter_input_rows(input_filename_big), shelf)
+        assert next(bms).title == 'Test 1'
+        assert spy.spy_return.cache_size == cache_size
+
+
 class TestXlsx2bmWriteOutput(object):
 
     @pytest.mark.skip()  # TODO Need to fix this test
@@ -72,3 +148,229 @@ class TestXlsx2bmWriteOutput(object):
         f = open(output_filename, 'r')
         lines = f.readlines()
         assert len(lines[0].split(',')) == len(data)
+
+    def test_write_output_files_single(self, tmp_path):
+        filename = str(tmp_path / 'single')
+        rows = [['a{}'.format(i), 'b'] for i in range(3)]
+        output = xls2bm.write_output_files(filename, rows, limit=3)
+        assert output == ['{}.csv'.format(filename)]
+        with open(output[0], encoding='utf-8') as f:
+            lines = f.read().splitlines()
+        assert len(lines) == 4
+        assert lines[0].startswith('\uFEFFTitle,')
+
+    def test_write_output_files_chunks(self, tmp_path):
+        filename = str(tmp_path / 'chunks')
+        rows = iter([['a{}'.format(i), 'b'] for i in range(7)])
+        output = xls2bm.write_output_files(filename, rows, limit=3)
+        assert output == ['{}_{}.csv'.format(filename, i) for i in (1, 2, 3)]
+        lines = []
+        for name in output:
+            with open(name, encoding='utf-8') as f:
+                chunk = f.read().splitlines()
+            assert chunk[0].startswith('\uFEFFTitle,')
+            assert not chunk[0].startswith('\uFEFF\uFEFF')
+            lines.extend(chunk[1:])
+        assert lines == ['a{},b'.format(i) for i in range(7)]
+
+    def test_convert_excel_to_csv(self, input_filename_big):
+        filename = input_filename_big.split('.xlsx')[0]
+        output = xls2bm.convert_excel_to_csv(filename).split(', ')
+        assert output == ['{}_1.csv'.format(filename),
+                          '{}_2.csv'.format(filename)]
+        with open(output[1], encoding='utf-8') as f:
+            lines = f.read().splitlines()
+        assert len(lines) == 5072 - 3000 + 1
+        assert lines[-1].startswith('Test 5072,http://test-rr-5072.de,')
+
+    def test_write_output_files_removes_files_on_error(self, tmp_path):
+        filename = str(tmp_path / 'broken')
+
+        def rows():
+            for i in range(4):
+                yield ['a{}'.format(i), 'b']
+            raise bookmark.ValidationError('Broken row')
+
+        with pytest.raises(bookmark.ValidationError):
+            xls2bm.write_output_files(filename, rows(), limit=3)
+        assert os.listdir(tmp_path) == []
+
+    def test_write_output_file_open_error(self, tmp_path, monkeypatch):
+        def denied(*args, **kwargs):
+            raise PermissionError('Denied')
+
+        monkeypatch.setattr(xls2bm, 'open', denied, raising=False)
+        with pytest.raises(PermissionError):
+            xls2bm.write_output_file(
+                str(tmp_path / 'denied.csv'), ['Title'], [])
+        assert os.listdir(tmp_path) == []
+
+    def test_convert_excel_to_csv_streaming(self, tmp_path,
+                                            convert_big_workbook):
+        contents = [
+            convert_big_workbook(
+                tmp_path / str(streaming), streaming=streaming)
+            for streaming in (False, True)]
+        assert len(contents[0]) == 2
+        assert contents[0] == contents[1]
+
+
+class TestXlsx2bmJobs(object):
+
+    ROWS = [
+        (title, url, keywords, None, 'published')
+        for title, url, keywords in [
+            ('Test 1', fix.URL_GOOD, 'test-1'),
+            ('{} long'.format(fix.TITLE_BAD), fix.URL_GOOD, 'test-2'),
+            ('Test 3', fix.URL_GOOD, 'test-3'),
+            ('Test 4', fix.URL_GOOD, 'test-4'),
+            ('Test 3', fix.URL_GOOD, 'test-5'),
+            ('{} longer'.format(fix.TITLE_BAD), fix.URL_GOOD, 'test-6'),
+            ('Test 7', fix.URL_BAD, 'test-7')]
+    ]
+
+    @pytest.fixture
+    def free_threaded(self, monkeypatch):
+        # Lets the thread executor run on builds with the GIL as well
+        monkeypatch.setattr(xls2bm.utils, 'is_gil_enabled', lambda: False)
+
+    @pytest.mark.parametrize('executor', ['process', 'thread'])
+    def test_iter_built_bookmarks_in_order(self, executor):
+        results = list(xls2bm.iter_built_bookmarks(
+            self.ROWS, None, jobs=2, chunk_size=2, executor=executor))
+        assert [bm.title for bm, _, _ in results[:6]] == [
+            'Test 1', fix.TITLE_BAD[:57] + '...', 'Test 3', 'Test 4',
+            'Test 3', fix.TITLE_BAD[:57] + '...']
+        assert results[1][1] == [
+            'Title has been shortened to \'{}...\''.format(
+                fix.TITLE_BAD[:57])]
+        assert results[0][1] == []
+        assert isinstance(results[6][2], bookmark.ValidationError)
+
+    @pytest.mark.parametrize('rows, error', [
+        (ROWS[:5], 'A bookmark with the title \'Test 3\' exists already'),
+        (ROWS[:2] + ROWS[6:], 'URL of \'Test 7\' could not be validated')
+    ])
+    @pytest.mark.parametrize('executor', ['process', 'thread'])
+    def test_errors_like_serial(self, tmp_path, capsys, free_threaded,
+                                write_workbook, rows, error, executor):
+        filename = str(tmp_path / 'jobs')
+        write_workbook('{}.xlsx'.format(filename), rows)
+        outputs = []
+        for jobs in (1, 2):
+            # Shelf conflicts are not handled by read_input_file
+            with pytest.raises((
+                    SystemExit, bookmark_shelf.ValidationError)) as e:
+                xls2bm.read_input_file(
+                    filename, jobs=jobs, executor=executor)
+            output = capsys.readouterr().out
+            if not isinstance(e.value, SystemExit):
+                output += str(e.value)
+            outputs.append(output)
+        assert outputs[0] == outputs[1]
+        assert outputs[0].startswith('Title has been shortened')
+        assert outputs[0].splitlines()[-1] == error
+
+    def test_convert_excel_to_csv_jobs(self, tmp_path, free_threaded,
+                                       convert_big_workbook):
+        contents = [
+            convert_big_workbook(
+                tmp_path / '{}_{}'.format(jobs, executor), jobs=jobs,
+                executor=executor)
+            for jobs, executor in ((1, 'process'), (3, 'process'),
+                                   (3, 'thread'))]
+        assert len(contents[0]) == 2
+        assert contents[0] == contents[1] == contents[2]
+
+    def test_thread_executor_with_gil(self, input_filename_big, monkeypatch,
+                                      mocker):
+        monkeypatch.setattr(xls2bm.utils, 'is_gil_enabled', lambda: True)
+        spy = mocker.spy(xls2bm, 'get_executor')
+        filename = input_filename_big.split('.xlsx')[0]
+        shelf = xls2bm.read_input_file(filename, jobs=4, executor='thread')
+        assert len(shelf.get_bookmarks()) == 5072
+        assert spy.call_count == 0
+
+    def test_unknown_executor(self):
+        with pytest.raises(ValueError):
+            list(xls2bm.iter_built_bookmarks(
+                self.ROWS, None, jobs=2, executor='cluster'))
+
+
+class TestXlsx2bmPipeline(object):
+
+    def test_convert_excel_to_csv_pipeline(self, tmp_path,
+                                           convert_big_workbook):
+        pipelines = [None, pipeline.Pipeline(queue_size=2)]
+        contents = [
+            convert_big_workbook(
+                tmp_path / str(index), my_pipeline=my_pipeline)
+            for index, my_pipeline in enumerate(pipelines)]
+        assert contents[0] == contents[1]
+        assert [s.name for s in pipelines[1].stages] == [
+            'read', 'validate', 'write']
+        assert [s.items for s in pipelines[1].stages] == [5072] * 3
+        assert all(q.max_depth <= 2 for q in pipelines[1].queues)
+
+    def test_pipeline_error_removes_files(self, tmp_path, capsys,
+                                          write_workbook):
+        rows = [('Test {}'.format(i), fix.URL_GOOD, 'test-{}'.format(i),
+                 None, 'published') for i in range(3500)]
+        rows.append(('Test 3500', fix.URL_BAD, 'test-3500', None,
+                     'published'))
+        write_workbook(str(tmp_path / 'broken.xlsx'), rows)
+        with pytest.raises(SystemExit):
+            xls2bm.convert_excel_to_csv(
+                str(tmp_path / 'broken'),
+                my_pipeline=pipeline.Pipeline())
+        assert capsys.readouterr().out == \
+            'URL of \'Test 3500\' could not be validated\n'
+        assert os.listdir(tmp_path) == ['broken.xlsx']
+
+
+class Unseekable(io.BytesIO):
+
+    # Behaves like a pipe or a socket
+    def seekable(self):
+        return False
+
+
+class TestXlsx2bmStreams(object):
+
+    def test_convert_excel_stream(self, tmp_path, monkeypatch,
+                                  convert_big_workbook):
+        data = base64.b64decode(b''.join(fix.TEST_XLSX_FILE_BIG))
+        expected = convert_big_workbook(tmp_path)
+        monkeypatch.chdir(tmp_path)
+        for streaming in (False, True):
+            output = xls2bm.convert_excel_stream(
+                Unseekable(data), streaming=streaming)
+            assert [f.getvalue() for f in output] == expected
+        assert sorted(os.listdir(tmp_path)) == [
+            'big.xlsx', 'big_1.csv', 'big_2.csv']
+
+    def test_convert_excel_stream_open_output(self):
+        data = base64.b64decode(b''.join(fix.TEST_XLSX_FILE_BIG))
+        outputs = {}
+
+        def open_output(counter):
+            outputs[counter] = io.BytesIO()
+            return io.TextIOWrapper(
+                outputs[counter], encoding='utf-8', newline='',
+                write_through=True)
+
+        streams = xls2bm.convert_excel_stream(
+            io.BytesIO(data), open_output, limit=5000)
+        assert len(streams) == 2
+        assert list(outputs) == [1, 2]
+        lines = outputs[2].getvalue().decode('utf-8').splitlines()
+        assert len(lines) == 73
+        assert lines[-1].startswith('Test 5072,')
+
+    def test_convert_excel_stream_error(self, write_workbook):
+        data = io.BytesIO()
+        write_workbook(data, [
+            ('Test 1', fix.URL_BAD, 'test-1', None, 'draft')])
+        data.seek(0)
+        with pytest.raises(bookmark.ValidationError):
+            xls2bm.convert_excel_stream(data)